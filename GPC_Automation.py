@@ -1,14 +1,29 @@
 import os
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, send_from_directory, abort
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 import asyncio
+import atexit
 import subprocess
 import json
+import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import signal
+import queue
+import re
 import sys
 import traceback
 import threading
-from collections import deque
+from collections import deque, namedtuple
+import contextvars
+import csv
+import hashlib
+import io
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 import time
+import uuid
+import zipfile
 
 # Ensure Playwright Chromium is installed only once
 venv_bin = os.path.dirname(sys.executable)
@@ -18,8 +33,75 @@ if not os.path.exists(os.path.join(os.path.expanduser("~"), ".cache", "ms-playwr
     subprocess.run([playwright_exec, "install", "chromium"], check=True)
 
 STORAGE_PATH = os.path.join(os.getcwd(), "storage", "auth.json")
+DEVELOPER_ID = os.environ.get("GPC_DEVELOPER_ID", "8453266419614197800")
+CONSOLE_URL = f"https://play.google.com/console/u/0/developers/{DEVELOPER_ID}"
 app = Flask(__name__)
 
+# Logging
+# Records are put on a queue by the calling thread and written as JSON lines to
+# stdout and a rotating file by a listener thread, so the event loop never
+# blocks on log I/O. Each record carries the worker/app/step bound to its context.
+LOG_DIR = os.path.join(os.getcwd(), "storage", "logs")
+LOG_LEVEL = os.environ.get("GPC_LOG_LEVEL", "INFO").upper()
+LOG_MAX_BYTES = int(os.environ.get("GPC_LOG_MAX_MB", "20")) * 1024 * 1024
+LOG_BACKUP_COUNT = int(os.environ.get("GPC_LOG_BACKUPS", "5"))
+
+log_context = contextvars.ContextVar("log_context", default={})
+
+def bind_log_context(**fields):
+    """Attach fields such as worker, app and step to later records from this context."""
+    log_context.set({**log_context.get(), **fields})
+
+class ContextQueueHandler(QueueHandler):
+    def prepare(self, record):
+        # Runs on the emitting thread: capture context and render args before queueing
+        record.context = log_context.get()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "thread": record.threadName,
+            **getattr(record, "context", {}),
+            "message": record.getMessage()
+        }
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+def setup_logging():
+    os.makedirs(LOG_DIR, exist_ok=True)
+    formatter = JsonFormatter()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    file_handler = RotatingFileHandler(
+        os.path.join(LOG_DIR, "automation.log"),
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding="utf-8"
+    )
+    for handler in (stream_handler, file_handler):
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, stream_handler, file_handler)
+    logger = logging.getLogger("gpc_automation")
+    logger.setLevel(LOG_LEVEL)
+    logger.addHandler(ContextQueueHandler(log_queue))
+    logger.propagate = False
+    listener.start()
+    # Registered before the worker's shutdown hook, so it runs after it and flushes its records
+    atexit.register(listener.stop)
+    return logger
+
+log = setup_logging()
+
 # Global state for session status
 session_status = {
     "valid": False,
@@ -33,13 +115,26 @@ class AutomationQueue:
         self.current_processing = None
         self.lock = threading.Lock()
         self.active = False
-
-    def add_apps(self, app_names):
+        self.loop = None
+        self.not_empty = None
+
+    def attach(self, loop):
+        """Bind to the worker's event loop so add_apps can wake a pending get()."""
+        self.loop = loop
+        self.not_empty = asyncio.Event()
+
+    def add_apps(self, app_names, app_ids=None):
+        """Queue apps by name. `app_ids` maps names of apps that already exist in
+        the console to their id, so their run resumes after create-app."""
+        app_ids = app_ids or {}
         with self.lock:
             timestamp = time.time()
             for app_name in app_names:
-                self.queue.append({'app_name': app_name, 'timestamp': timestamp})
-            return len(self.queue)
+                self.queue.append({'app_name': app_name, 'app_id': app_ids.get(app_name), 'timestamp': timestamp})
+            queue_size = len(self.queue)
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.not_empty.set)
+        return queue_size
 
     def get_next_app(self):
         with self.lock:
@@ -48,6 +143,32 @@ class AutomationQueue:
                 return self.current_processing
             return None
 
+    async def get(self, interrupt=None):
+        """Wait for the next queued app.
+
+        Returns None early if the `interrupt` event is set while waiting.
+        """
+        announced = False
+        while True:
+            # Clear before checking so an add_apps racing with us still wakes the wait
+            self.not_empty.clear()
+            next_app = self.get_next_app()
+            if next_app is not None:
+                return next_app
+            if interrupt is not None and interrupt.is_set():
+                return None
+            if not announced:
+                log.info("⏳ Queue is empty, waiting...")
+                announced = True
+            waiters = [asyncio.ensure_future(self.not_empty.wait())]
+            if interrupt is not None:
+                waiters.append(asyncio.ensure_future(interrupt.wait()))
+            try:
+                await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for waiter in waiters:
+                    waiter.cancel()
+
     def get_status(self):
         with self.lock:
             return {
@@ -66,30 +187,751 @@ class AutomationQueue:
             self.active = False
             self.current_processing = None
 
+    def remove_app(self, app_name):
+        """Drop every queued entry for app_name. Returns how many were removed."""
+        with self.lock:
+            before = len(self.queue)
+            self.queue = deque(item for item in self.queue if item['app_name'] != app_name)
+            return before - len(self.queue)
+
 automation_queue = AutomationQueue()
+
+# Worker control
+class WorkerControl:
+    """Pause, resume, drain, cancel and shutdown for the automation worker.
+
+    Flask handlers call in from their own threads; the worker's event loop is
+    woken with call_soon_threadsafe. Once a step has clicked save, cancelling
+    the in-flight app is deferred until that step, including its post-save
+    settle, has finished.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.paused = False
+        self.draining = False
+        self.exiting = False
+        self.loop = None
+        self.changed = None
+        self.task = None
+        self.app_name = None
+        self.saving = False
+        self.cancel_requested = False
+        self.stopped = threading.Event()
+
+    def attach(self, loop):
+        self.loop = loop
+        self.changed = asyncio.Event()
+
+    def _notify(self):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.changed.set)
+
+    async def wait_for_change(self, timeout=None):
+        try:
+            await asyncio.wait_for(self.changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self.changed.clear()
+
+    async def wait_while_paused(self):
+        # A shutdown lets a paused app run to completion instead of hanging
+        while self.paused and not self.exiting:
+            await self.wait_for_change()
+
+    def accepting_work(self):
+        return not self.paused and not self.draining
+
+    def begin_app(self, task, app_name):
+        with self.lock:
+            self.task = task
+            self.app_name = app_name
+
+    def end_app(self):
+        with self.lock:
+            self.task = None
+            self.app_name = None
+            self.saving = False
+            self.cancel_requested = False
+
+    def _cancel_current(self):
+        if self.task is None:
+            return False
+        if self.saving:
+            self.cancel_requested = True
+        else:
+            self.loop.call_soon_threadsafe(self.task.cancel)
+        return True
+
+    def begin_save(self):
+        """Hold off cancellation of the current app until the current step ends."""
+        with self.lock:
+            self.saving = True
+
+    def end_step(self):
+        """Release a save hold. Returns whether a cancel arrived while it was held."""
+        with self.lock:
+            self.saving = False
+            pending, self.cancel_requested = self.cancel_requested, False
+        return pending
+
+    def pause(self):
+        with self.lock:
+            self.paused = True
+        self._notify()
+
+    def resume(self):
+        with self.lock:
+            self.paused = False
+            self.draining = False
+        self._notify()
+
+    def drain(self):
+        with self.lock:
+            self.draining = True
+        self._notify()
+
+    def cancel(self, app_name):
+        """Cancel app_name if it is in flight. Returns whether it was."""
+        with self.lock:
+            if self.app_name != app_name:
+                return False
+            return self._cancel_current()
+
+    def shutdown(self, force=False):
+        with self.lock:
+            self.draining = True
+            self.exiting = True
+            if force:
+                self._cancel_current()
+        self._notify()
+
+    def get_status(self):
+        with self.lock:
+            if self.stopped.is_set():
+                state = "stopped"
+            elif self.exiting:
+                state = "shutting_down"
+            elif self.draining:
+                state = "draining" if self.task else "drained"
+            elif self.paused:
+                state = "paused"
+            else:
+                state = "running"
+            return {"state": state, "current_app": self.app_name}
+
+worker_control = WorkerControl()
+
+# Pacing between apps
+class PacingPolicy:
+    """Minimum gap between one app finishing and the next one starting.
+
+    The gap only applies to back-to-back apps; work submitted to an idle
+    worker starts straight away once the gap has elapsed.
+    """
+
+    def __init__(self, gap, failure_gap):
+        self.gap = gap
+        self.failure_gap = failure_gap
+        self.ready_at = 0.0
+
+    def finished(self, status):
+        gap = self.gap if status == "success" else self.failure_gap
+        self.ready_at = time.monotonic() + gap
+
+    def remaining(self):
+        return max(0.0, self.ready_at - time.monotonic())
+
+INTER_APP_DELAY = float(os.environ.get("GPC_INTER_APP_DELAY", "10"))
+pacing_policy = PacingPolicy(
+    INTER_APP_DELAY,
+    float(os.environ.get("GPC_INTER_APP_DELAY_AFTER_FAILURE", INTER_APP_DELAY))
+)
 automation_status = {"running": False}
 DEFAULT_TIMEOUT = 300000  # 5 minutes
 
+# Rate limiting
+# Limits are (tokens per second, burst size) per action type. Override with
+# GPC_RATE_LIMITS='{"navigation": [0.2, 3]}' and per account with
+# GPC_ACCOUNT_RATE_LIMITS='{"<developer id>": {"save": [0.05, 1]}}'.
+DEFAULT_RATE_LIMITS = {
+    "navigation": (0.2, 3),  # one page load every 5s, bursts of 3
+    "save": (0.1, 2),        # one save every 10s, bursts of 2
+}
+ERROR_BANNER_SELECTOR = "text=/something went wrong/i"
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, now):
+        """Take a token and return how many seconds the caller must wait for it."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+class ActionScheduler:
+    """Token-bucket scheduler shared by every navigation and save.
+
+    Buckets are kept per (account, action). Failures reported by callers put the
+    whole account into an exponential backoff that decays again on success.
+    """
+
+    def __init__(self, limits, account_limits=None, min_backoff=5.0, max_backoff=120.0):
+        self.limits = limits
+        self.account_limits = account_limits or {}
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.buckets = {}
+        self.backoff = {}
+        self.paused_until = {}
+        self.lock = threading.Lock()
+
+    def _bucket(self, account, action):
+        key = (account, action)
+        if key not in self.buckets:
+            limits = self.account_limits.get(account, {})
+            rate, burst = limits.get(action) or self.limits.get(action) or self.limits["navigation"]
+            self.buckets[key] = TokenBucket(float(rate), float(burst))
+        return self.buckets[key]
+
+    async def acquire(self, action, account=DEVELOPER_ID):
+        with self.lock:
+            now = time.monotonic()
+            wait = self._bucket(account, action).reserve(now)
+            wait = max(wait, self.paused_until.get(account, 0) - now)
+        if wait > 0:
+            log.info("🚦 Throttling %s for %.1fs", action, wait)
+            await asyncio.sleep(wait)
+
+    def report_failure(self, reason, account=DEVELOPER_ID):
+        with self.lock:
+            delay = min(self.max_backoff, max(self.min_backoff, self.backoff.get(account, 0) * 2))
+            self.backoff[account] = delay
+            self.paused_until[account] = time.monotonic() + delay
+        log.info("🐢 Backing off %.0fs after %s", delay, reason)
+
+    def report_success(self, account=DEVELOPER_ID):
+        with self.lock:
+            delay = self.backoff.get(account, 0) / 2
+            self.backoff[account] = delay if delay >= self.min_backoff else 0
+
+    def get_status(self):
+        with self.lock:
+            now = time.monotonic()
+            return {
+                account: {
+                    "backoff": delay,
+                    "paused_for": max(0.0, self.paused_until.get(account, 0) - now)
+                }
+                for account, delay in self.backoff.items()
+            }
+
+action_scheduler = ActionScheduler(
+    {**DEFAULT_RATE_LIMITS, **json.loads(os.environ.get("GPC_RATE_LIMITS", "{}"))},
+    json.loads(os.environ.get("GPC_ACCOUNT_RATE_LIMITS", "{}"))
+)
+
+# Browser resource governance
+# Contexts are recycled after GPC_RECYCLE_CONTEXT_AFTER_APPS apps or when renderer
+# RSS passes GPC_MAX_RENDERER_RSS_MB; the whole browser after
+# GPC_RECYCLE_BROWSER_AFTER_APPS apps or GPC_MAX_BROWSER_RSS_MB in total.
+WORKER_ID = os.environ.get("GPC_WORKER_ID", "worker-1")
+BROWSER_ARGS = ["--no-sandbox", "--start-maximized"]
+RECYCLE_CONTEXT_AFTER_APPS = int(os.environ.get("GPC_RECYCLE_CONTEXT_AFTER_APPS", "10"))
+RECYCLE_BROWSER_AFTER_APPS = int(os.environ.get("GPC_RECYCLE_BROWSER_AFTER_APPS", "50"))
+MAX_RENDERER_RSS = int(os.environ.get("GPC_MAX_RENDERER_RSS_MB", "1500")) * 1024 * 1024
+MAX_BROWSER_RSS = int(os.environ.get("GPC_MAX_BROWSER_RSS_MB", "3000")) * 1024 * 1024
+MEMORY_SAMPLE_SECONDS = float(os.environ.get("GPC_MEMORY_SAMPLE_SECONDS", "30"))
+BROWSER_RETRY_SECONDS = float(os.environ.get("GPC_BROWSER_RETRY_SECONDS", "30"))
+
+def sample_browser_memory():
+    """RSS in bytes of the Chromium processes started by this process.
+
+    Reads /proc, so returns None on platforms without it.
+    """
+    if not os.path.isdir("/proc/self"):
+        return None
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces, so split after its closing paren
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    usage = {"browser": 0, "renderers": 0, "other": 0, "renderer_count": 0}
+    pending = list(children.get(os.getpid(), []))
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                cmdline = f.read().decode(errors="replace").split("\0")
+            with open(f"/proc/{pid}/statm") as f:
+                rss = int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+        executable = os.path.basename(cmdline[0]).lower()
+        if "chrom" not in executable and "headless_shell" not in executable:
+            continue
+        if "--type=renderer" in cmdline:
+            usage["renderers"] += rss
+            usage["renderer_count"] += 1
+        elif not any(arg.startswith("--type=") for arg in cmdline):
+            usage["browser"] += rss
+        else:
+            usage["other"] += rss
+    usage["total"] = usage["browser"] + usage["renderers"] + usage["other"]
+    return usage
+
+class BrowserSession:
+    """A worker's Chromium browser and context, recycled as they age, bloat or crash.
+
+    Recycling only happens between apps (in prepare), before the next app is
+    taken off the queue. A renderer crash fails the app it happened in (see
+    PageCrashedError) and the context is replaced before the next one. New
+    contexts are restored from STORAGE_PATH.
+    """
+
+    def __init__(self, playwright, worker_id):
+        self.playwright = playwright
+        self.worker_id = worker_id
+        self.browser = None
+        self.context = None
+        self.apps_on_context = 0
+        self.apps_on_browser = 0
+        self.recycles = {"context": 0, "browser": 0}
+        self.memory = None
+        self.crashed = False
+        self.disconnected = False
+        self.watchdog = None
+
+    async def start(self):
+        await self.launch()
+        await self.new_context()
+        self.watchdog = asyncio.create_task(self._watch_memory())
+
+    async def launch(self):
+        self.browser = await self.playwright.chromium.launch(headless=True, args=BROWSER_ARGS)
+        self.browser.on("disconnected", lambda browser: self._mark_disconnected())
+        self.disconnected = False
+        self.apps_on_browser = 0
+
+    async def new_context(self):
+        if os.path.exists(STORAGE_PATH):
+            self.context = await self.browser.new_context(storage_state=STORAGE_PATH, no_viewport=True)
+        else:
+            self.context = await self.browser.new_context(no_viewport=True)
+        self.context.on("page", lambda page: page.on("crash", lambda crashed_page: self._mark_crashed()))
+        self.crashed = False
+        self.apps_on_context = 0
+
+    def _mark_crashed(self):
+        log.warning("💥 Renderer crashed in %s", self.worker_id)
+        self.crashed = True
+
+    def _mark_disconnected(self):
+        self.disconnected = True
+
+    async def _watch_memory(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                self.memory = await loop.run_in_executor(None, sample_browser_memory)
+            except Exception as e:
+                log.warning("⚠️ Memory sampling failed: %s", e)
+            await asyncio.sleep(MEMORY_SAMPLE_SECONDS)
+
+    def _recycle_reason(self):
+        """Return (whole_browser, reason) if the browser or context is due for recycling."""
+        memory = self.memory or {}
+        if self.disconnected:
+            return True, "browser disconnected"
+        if memory.get("total", 0) > MAX_BROWSER_RSS:
+            return True, f"browser RSS {memory['total'] // 2**20}MB"
+        if self.apps_on_browser >= RECYCLE_BROWSER_AFTER_APPS:
+            return True, f"{self.apps_on_browser} apps on this browser"
+        if self.crashed:
+            return False, "renderer crash"
+        if memory.get("renderers", 0) > MAX_RENDERER_RSS:
+            return False, f"renderer RSS {memory['renderers'] // 2**20}MB"
+        if self.apps_on_context >= RECYCLE_CONTEXT_AFTER_APPS:
+            return False, f"{self.apps_on_context} apps on this context"
+        return None
+
+    async def prepare(self):
+        """Recycle the context or browser before the next app if it is due."""
+        due = self._recycle_reason()
+        if due:
+            try:
+                await self.recycle(*due)
+            except Exception:
+                # The old context may already be closed; start from a new browser next time
+                self.disconnected = True
+                raise
+
+    def app_finished(self):
+        self.apps_on_context += 1
+        self.apps_on_browser += 1
+
+    async def recycle(self, whole_browser, reason):
+        log.info("♻️ Recycling %s for %s: %s", 'browser' if whole_browser else 'context', self.worker_id, reason)
+        # Keep cookies refreshed during the run for the new context
+        if session_status.get("valid") and not self.disconnected:
+            try:
+                await self.context.storage_state(path=STORAGE_PATH)
+            except Exception as e:
+                log.warning("⚠️ Could not save session before recycling: %s", e)
+        try:
+            await self.context.close()
+        except Exception:
+            pass
+        if whole_browser:
+            try:
+                await self.browser.close()
+            except Exception:
+                pass
+            await self.launch()
+            self.recycles["browser"] += 1
+        else:
+            self.recycles["context"] += 1
+        await self.new_context()
+        self.memory = await asyncio.get_running_loop().run_in_executor(None, sample_browser_memory)
+
+    async def close(self):
+        if self.watchdog:
+            self.watchdog.cancel()
+        await self.context.close()
+        await self.browser.close()
+
+    def get_status(self):
+        memory = self.memory
+        return {
+            "memory_mb": {key: round(value / 2**20, 1) for key, value in memory.items() if key != "renderer_count"} if memory else None,
+            "renderer_count": memory["renderer_count"] if memory else None,
+            "apps_on_context": self.apps_on_context,
+            "apps_on_browser": self.apps_on_browser,
+            "recycles": dict(self.recycles)
+        }
+
+browser_sessions = {}
+
+class PageCrashedError(Exception):
+    pass
+
+def renderer_crashed(error=None):
+    """Whether the worker's renderer has crashed, judged by its crash event or an error message."""
+    session = browser_sessions.get(WORKER_ID)
+    if session is not None and session.crashed:
+        return True
+    return error is not None and ("Page crashed" in str(error) or "Target crashed" in str(error))
+
+async def has_error_banner(page):
+    try:
+        return await page.query_selector(ERROR_BANNER_SELECTOR) is not None
+    except Exception:
+        return False
+
+# Failure artifacts
+# On a failed app the screenshot, DOM and (with GPC_CAPTURE_TRACES=1) a Playwright
+# trace are zipped into a size-capped directory, evicting least recently used first.
+ARTIFACTS_DIR = os.path.join(os.getcwd(), "storage", "artifacts")
+ARTIFACTS_MAX_BYTES = int(os.environ.get("GPC_ARTIFACTS_MAX_MB", "500")) * 1024 * 1024
+CAPTURE_TRACES = os.environ.get("GPC_CAPTURE_TRACES", "0") == "1"
+
+class ArtifactStore:
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.index = {}
+        self.lock = threading.Lock()
+        # A single writer thread keeps compression and eviction off the event loop
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="artifact-writer")
+        os.makedirs(root, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        for name in sorted(os.listdir(self.root)):
+            if not name.endswith(".zip") or name.startswith("."):
+                continue
+            try:
+                with zipfile.ZipFile(os.path.join(self.root, name)) as archive:
+                    meta = json.loads(archive.read("meta.json"))
+                self.index.setdefault(meta["app_name"], []).append(name)
+            except Exception:
+                continue
+
+    async def capture(self, page, run, error, trace_path=None):
+        """Grab the failing page's state and queue it for writing. Returns the artifact name."""
+        screenshot = dom = None
+        try:
+            screenshot = await page.screenshot(full_page=True, timeout=10000)
+        except Exception as e:
+            log.warning("⚠️ Could not capture screenshot: %s", e)
+        try:
+            dom = await page.content()
+        except Exception as e:
+            log.warning("⚠️ Could not capture DOM snapshot: %s", e)
+
+        safe_name = re.sub(r'[^A-Za-z0-9_-]+', '_', run["app_name"])[:40]
+        name = f"{safe_name}_{run['step']}_{int(time.time())}_{uuid.uuid4().hex[:6]}.zip"
+        meta = {
+            "app_name": run["app_name"],
+            "app_id": run["app_id"],
+            "step": run["step"],
+            "url": page.url,
+            "error": str(error),
+            "traceback": "".join(traceback.format_exception(type(error), error, error.__traceback__)),
+            "captured_at": time.time()
+        }
+        self.executor.submit(self._write, name, meta, screenshot, dom, trace_path)
+        return name
+
+    def _write(self, name, meta, screenshot, dom, trace_path):
+        tmp_path = os.path.join(self.root, f".{name}.tmp")
+        try:
+            with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                archive.writestr("meta.json", json.dumps(meta, indent=2))
+                if screenshot:
+                    archive.writestr("screenshot.png", screenshot)
+                if dom:
+                    archive.writestr("dom.html", dom)
+                if trace_path and os.path.exists(trace_path):
+                    archive.write(trace_path, "trace.zip")
+            os.replace(tmp_path, os.path.join(self.root, name))
+            with self.lock:
+                self.index.setdefault(meta["app_name"], []).append(name)
+            log.info("📦 Saved failure artifacts %s", name)
+            self._evict()
+        except Exception as e:
+            log.error("❌ Failed to write artifacts %s: %s", name, e)
+        finally:
+            for path in (tmp_path, trace_path):
+                if path and os.path.exists(path):
+                    os.remove(path)
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.root):
+            if name.endswith(".zip") and not name.startswith("."):
+                stat = os.stat(os.path.join(self.root, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.root, name))
+            total -= size
+            with self.lock:
+                for names in self.index.values():
+                    if name in names:
+                        names.remove(name)
+            log.info("🗑️ Evicted artifacts %s", name)
+
+    def touch(self, name):
+        """Mark an artifact as recently used so eviction keeps it."""
+        path = os.path.join(self.root, name)
+        if os.path.exists(path):
+            os.utime(path)
+            return True
+        return False
+
+    def get_links(self):
+        with self.lock:
+            return {
+                app_name: [f"/artifacts/{name}" for name in names]
+                for app_name, names in self.index.items() if names
+            }
+
+artifact_store = ArtifactStore(ARTIFACTS_DIR, ARTIFACTS_MAX_BYTES)
+
+async def capture_failure_artifacts(context, page, run, error):
+    trace_path = None
+    if CAPTURE_TRACES:
+        trace_path = os.path.join(ARTIFACTS_DIR, f".trace-{uuid.uuid4().hex}.zip")
+        try:
+            await context.tracing.stop(path=trace_path)
+        except Exception as e:
+            log.warning("⚠️ Could not save trace: %s", e)
+            trace_path = None
+    return await artifact_store.capture(page, run, error, trace_path)
+
+# Result ledger
+RESULTS_DB_PATH = os.path.join(os.getcwd(), "storage", "results.db")
+
+class ResultLedger:
+    """SQLite record of every processed app, with per-step timings."""
+
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self.lock, self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS results (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    app_name TEXT NOT NULL,
+                    app_id TEXT,
+                    status TEXT NOT NULL,
+                    started_at REAL NOT NULL,
+                    finished_at REAL NOT NULL,
+                    duration REAL NOT NULL,
+                    failed_step TEXT,
+                    error TEXT,
+                    soft_failure_count INTEGER NOT NULL DEFAULT 0,
+                    soft_failures TEXT,
+                    artifact TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_results_app_name ON results (app_name, finished_at);
+                CREATE INDEX IF NOT EXISTS idx_results_status ON results (status, finished_at);
+                CREATE INDEX IF NOT EXISTS idx_results_finished_at ON results (finished_at);
+                CREATE TABLE IF NOT EXISTS step_timings (
+                    result_id INTEGER NOT NULL REFERENCES results (id),
+                    step TEXT NOT NULL,
+                    duration REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_step_timings_step ON step_timings (step);
+            """)
+
+    def record(self, run, status, error=None, artifact=None):
+        finished_at = time.time()
+        with self.lock, self.conn:
+            cursor = self.conn.execute(
+                """INSERT INTO results (app_name, app_id, status, started_at, finished_at, duration,
+                                        failed_step, error, soft_failure_count, soft_failures, artifact)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (run["app_name"], run["app_id"], status, run["started_at"], finished_at,
+                 finished_at - run["started_at"], run["step"] if error else None,
+                 str(error) if error else None, len(run["soft_failures"]),
+                 json.dumps(run["soft_failures"]), artifact)
+            )
+            self.conn.executemany(
+                "INSERT INTO step_timings (result_id, step, duration) VALUES (?, ?, ?)",
+                [(cursor.lastrowid, step, duration) for step, duration in run["step_timings"]]
+            )
+
+    def _where(self, app_name=None, status=None, since=None, until=None):
+        clauses, params = [], []
+        if app_name:
+            clauses.append("app_name = ?")
+            params.append(app_name)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if since is not None:
+            clauses.append("finished_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("finished_at < ?")
+            params.append(until)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, limit=None, offset=0, **filters):
+        """Return (rows, total) matching the filters, newest first."""
+        where, params = self._where(**filters)
+        sql = f"SELECT * FROM results{where} ORDER BY finished_at DESC"
+        with self.lock:
+            total = self.conn.execute(f"SELECT COUNT(*) FROM results{where}", params).fetchone()[0]
+            if limit is not None:
+                rows = self.conn.execute(sql + " LIMIT ? OFFSET ?", params + [limit, offset]).fetchall()
+            else:
+                rows = self.conn.execute(sql, params).fetchall()
+        rows = [dict(row) for row in rows]
+        for row in rows:
+            row["soft_failures"] = json.loads(row["soft_failures"] or "[]")
+        return rows, total
+
+    def failed_apps(self, **filters):
+        """Apps whose latest result within the filters failed, with the console app
+        id of any earlier run that got past create-app. Apps an operator cancelled
+        are left out."""
+        where, params = self._where(**filters)
+        with self.lock:
+            rows = self.conn.execute(
+                f"""SELECT app_name,
+                           (SELECT app_id FROM results AS created
+                            WHERE created.app_name = results.app_name AND created.app_id IS NOT NULL
+                            ORDER BY created.id DESC LIMIT 1) AS app_id
+                    FROM results
+                    WHERE id IN (SELECT MAX(id) FROM results{where} GROUP BY app_name)
+                    AND status NOT IN ('success', 'cancelled')""",
+                params
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def average_step_durations(self, recent=20):
+        """Mean duration per step over its most recent completions."""
+        with self.lock:
+            rows = self.conn.execute(
+                """SELECT step, AVG(duration) AS duration FROM (
+                       SELECT step, duration, ROW_NUMBER() OVER (PARTITION BY step ORDER BY result_id DESC) AS n
+                       FROM step_timings
+                   ) WHERE n <= ? GROUP BY step""",
+                (recent,)
+            ).fetchall()
+        return {row["step"]: row["duration"] for row in rows}
+
+    def succeeded_app_names(self, app_names):
+        app_names = list(app_names)
+        if not app_names:
+            return []
+        with self.lock:
+            rows = self.conn.execute(
+                f"""SELECT DISTINCT app_name FROM results
+                    WHERE status = 'success' AND app_name IN ({", ".join("?" * len(app_names))})""",
+                app_names
+            ).fetchall()
+        return [row["app_name"] for row in rows]
+
+    def created_app_ids(self, app_names):
+        """Latest console app id recorded for each name that got past create-app."""
+        app_names = list(app_names)
+        if not app_names:
+            return {}
+        with self.lock:
+            rows = self.conn.execute(
+                f"""SELECT app_name, app_id FROM results
+                    WHERE id IN (SELECT MAX(id) FROM results
+                                 WHERE app_id IS NOT NULL AND app_name IN ({", ".join("?" * len(app_names))})
+                                 GROUP BY app_name)""",
+                app_names
+            ).fetchall()
+        return {row["app_name"]: row["app_id"] for row in rows}
+
+result_ledger = ResultLedger(RESULTS_DB_PATH)
+
 async def check_session_validity(page):
     try:
         # Check if we're on a login page or session is expired
         await page.wait_for_selector('text=Sign in', timeout=5000)
         return False, "Session expired or not logged in"
-    except:
+    except Exception:
         try:
             # Check if we're on the expected page
             await page.wait_for_selector("#main-content", timeout=5000)
             return True, "Session is valid"
-        except:
+        except Exception:
             return False, "Unable to verify session status"
 
 async def wait_for_login(page):
-    print("🔐 Please log in manually...", flush=True)
+    log.info("🔐 Please log in manually...")
     while True:
         try:
             await page.wait_for_selector('text=Dashboard', timeout=5000)
             break
-        except:
+        except Exception:
             await asyncio.sleep(2)
 
 async def wait_for_element(page, selector, timeout=DEFAULT_TIMEOUT, state="visible"):
@@ -99,48 +941,71 @@ async def wait_for_element(page, selector, timeout=DEFAULT_TIMEOUT, state="visib
         await element.scroll_into_view_if_needed()
         return element
     except PlaywrightTimeoutError:
-        print(f"⏰ Timeout {timeout}ms waiting for element: {selector}", flush=True)
+        log.warning("⏰ Timeout %sms waiting for element: %s", timeout, selector)
         raise
     except Exception as e:
-        print(f"❌ Unexpected error waiting for element: {selector} - {str(e)}", flush=True)
+        log.error("❌ Unexpected error waiting for element: %s - %s", selector, e)
         raise
 
+NAVIGATION_ATTEMPTS = int(os.environ.get("GPC_NAVIGATION_ATTEMPTS", "6"))
+
+class NavigationError(Exception):
+    pass
+
 async def goto_app_section_until_success(page, app_id, section):
-    url = f"https://play.google.com/console/u/0/developers/8453266419614197800/app/{app_id}/app-content/{section}?source=dashboard"
-    print(f"🌐 Navigating to {section} page...", flush=True)
+    url = f"{CONSOLE_URL}/app/{app_id}/app-content/{section}?source=dashboard"
+    log.info("🌐 Navigating to %s page...", section)
     
-    retries = 0
-    while True:
+    # The page we are leaving still shows the outcome of the previous save
+    if await has_error_banner(page):
+        action_scheduler.report_failure("error banner after save")
+
+    for attempt in range(1, NAVIGATION_ATTEMPTS + 1):
+        if renderer_crashed():
+            raise PageCrashedError(f"Renderer crashed before opening {section}")
+        await action_scheduler.acquire("navigation")
         try:
             await page.goto(url, wait_until="domcontentloaded", timeout=60000)  # 60 sec timeout
-            print(f"✅ Successfully navigated to {section}", flush=True)
-            break
+            if await has_error_banner(page):
+                raise Exception("Console rendered an error page")
+            log.info("✅ Successfully navigated to %s", section)
+            action_scheduler.report_success()
+            return
         except Exception as e:
-            print(f"⚠️ Failed to navigate ({e}), retrying...", flush=True)
-            retries += 1
-            if "Page crashed" in str(e) or retries > 5:
-                print("🔄 Refreshing page due to crash or too many retries...", flush=True)
+            # A crashed page never recovers; fail the app so the context gets replaced
+            if renderer_crashed(e):
+                raise PageCrashedError(f"Renderer crashed while opening {section}: {e}") from e
+            log.warning("⚠️ Failed to navigate (%s), attempt %d/%d", e, attempt, NAVIGATION_ATTEMPTS)
+            # Only the first failure counts against the account; further retries of
+            # this one page back off locally so a broken section can't stall every app
+            if attempt == 1:
+                action_scheduler.report_failure(f"navigation failure on {section}")
+            else:
+                await asyncio.sleep(min(30, 2 ** attempt))
+            if attempt > NAVIGATION_ATTEMPTS // 2:
+                log.info("🔄 Refreshing page after repeated failures...")
                 try:
                     await page.reload(wait_until="domcontentloaded")
-                except:
+                except Exception:
                     pass  # Ignore reload errors
-            await asyncio.sleep(2)
+
+    raise NavigationError(f"Could not open {section} after {NAVIGATION_ATTEMPTS} attempts")
 
 async def click_element(page, element, description=""):
     """Enhanced click with multiple fallback methods."""
     try:
         await element.click()
-        print(f"✅ Clicked {description}", flush=True)
+        log.debug("✅ Clicked %s", description)
     except Exception:
         try:
             await element.dispatch_event('click')
-            print(f"ℹ️ Used dispatch_event for {description}", flush=True)
+            log.debug("ℹ️ Used dispatch_event for %s", description)
         except Exception:
             try:
                 await page.evaluate("el => el.click()", element)
-                print(f"ℹ️ Used JS click for {description}", flush=True)
+                log.debug("ℹ️ Used JS click for %s", description)
             except Exception:
-                print(f"❌ Failed to click {description}", flush=True)
+                log.error("❌ Failed to click %s", description)
                 raise
 
 async def click_button_by_material_radio_debug_id(page, debug_id):
@@ -157,9 +1022,9 @@ async def click_button_by_material_radio_group_debug_id(page, debug_id, index=0)
     group_selector = f"material-radio-group[debug-id='{debug_id}']"
     try:
         group = await wait_for_element(page, group_selector)
-        print(f"✅ Radio group container found: {debug_id}", flush=True)
+        log.debug("✅ Radio group container found: %s", debug_id)
     except Exception:
-        print(f"❌ Failed to find radio group container: {debug_id}", flush=True)
+        log.error("❌ Failed to find radio group container: %s", debug_id)
         raise
 
     radio_selector = f"{group_selector} input[type='radio'], {group_selector} [role='radio']"
@@ -175,7 +1040,7 @@ async def click_button_by_material_radio_group_debug_id(page, debug_id, index=0)
 
     except Exception as e:
         found_count = len(await page.query_selector_all(radio_selector))
-        print(f"  Found {found_count} radio buttons in group", flush=True)
+        log.warning("  Found %s radio buttons in group", found_count)
         raise Exception(f"Failed to click radio button {index} in group '{debug_id}'") from e
 
 async def click_button_ingroup_by_material_radio_group_debug_id(page, parent_debug_id, parent_index, debug_id, child_index, radio_button_index):
@@ -201,23 +1066,28 @@ async def click_button_ingroup_by_material_radio_group_debug_id(page, parent_deb
                     radio_buttons = await group.query_selector_all("input[type='radio']")
                     if len(radio_buttons) > radio_button_index:
                         await click_radio(radio_buttons[radio_button_index])
-                        print(f"Radio button {radio_button_index + 1} clicked in parent index {parent_index}, group {i + 1}.", flush=True)
+                        log.debug("Radio button %s clicked in parent index %s, group %s.", radio_button_index + 1, parent_index, i + 1)
             else:
                 if len(material_radio_groups) > child_index:
                     group = material_radio_groups[child_index]
                     radio_buttons = await group.query_selector_all("input[type='radio']")
                     if len(radio_buttons) > radio_button_index:
                         await click_radio(radio_buttons[radio_button_index])
-                        print(f"Radio button {radio_button_index + 1} clicked in parent index {parent_index}, child index {child_index}.", flush=True)
+                        log.debug("Radio button %s clicked in parent index %s, child index %s.", radio_button_index + 1, parent_index, child_index)
     except Exception as e:
-        print(f"Error while interacting: {e}", flush=True)
+        log.warning("Error while interacting: %s", e)
 
-async def click_button_by_xpath(page, xpath):
+async def click_button_by_xpath(page, xpath, action=None):
+    """Click by XPath; saves and navigations pass `action` to go through the scheduler."""
     try:
+        if action:
+            await action_scheduler.acquire(action)
         element = await wait_for_element(page, f'xpath={xpath}')
+        if action == "save":
+            worker_control.begin_save()
         await click_element(page, element, f"XPath {xpath}")
     except Exception:
-        print(f"❌ XPath click failed: {xpath}", flush=True)
+        log.error("❌ XPath click failed: %s", xpath)
         raise
 
 async def click_checkbox_by_debug_id(page, debug_id, index=0):
@@ -227,40 +1097,23 @@ async def click_checkbox_by_debug_id(page, debug_id, index=0):
 
         checkboxes = await page.query_selector_all(container_selector)
         if index >= len(checkboxes):
-            print(f"Invalid index {index}. Only {len(checkboxes)} checkboxes available.", flush=True)
+            log.warning("Invalid index %s. Only %s checkboxes available.", index, len(checkboxes))
             return
 
         container = checkboxes[index]
         await page.evaluate("el => el.scrollIntoView({ behavior: 'smooth', block: 'center' })", container)
         checkbox = await container.query_selector("input[type='checkbox']")
         await click_element(page, checkbox, f"checkbox {debug_id}")
-        print(f"Checkbox {index} clicked.", flush=True)
+        log.debug("Checkbox %s clicked.", index)
     except Exception as e:
-        print(f"Checkbox click error: {e}", flush=True)
+        log.warning("Checkbox click error: %s", e)
         raise
 
-async def upload_csv_from_static_file(page, filename, timeout=30000):
-    """
-    Upload CSV file from static folder, retrying up to 5 times if upload confirmation fails.
-
-    Args:
-        page: Playwright page object
-        filename: Name of file in static folder
-        timeout: Maximum time to wait for file input (ms)
-    """
-    static_folder = os.path.join(os.getcwd(), 'static')
-    file_path = os.path.join(static_folder, filename)
-
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"File not found in static folder: {filename}")
-    if not filename.lower().endswith('.csv'):
-        print(f"⚠️ Warning: File '{filename}' may not be a CSV file")
-
-    file_input_selector = "input[type='file']"
-    
+async def get_file_input(page, selector="input[type='file']", timeout=30000):
+    """Wait for a file input to be attached and enabled."""
     try:
         file_input = await page.wait_for_selector(
-            file_input_selector,
+            selector,
             state="attached",
             timeout=timeout
         )
@@ -270,563 +1123,1099 @@ async def upload_csv_from_static_file(page, filename, timeout=30000):
             raise Exception("File input is disabled!")
     except Exception as e:
         raise Exception(f"File input not ready: {str(e)}")
+    return file_input
 
-    max_attempts = 5
+async def upload_files_with_retries(page, file_input, files, confirm_selector, label, max_attempts=5):
+    """
+    Set files on a file input, retrying until confirm_selector shows up on the page.
+
+    Args:
+        page: Playwright page object
+        file_input: File input element handle
+        files: Path or list of paths to upload
+        confirm_selector: Selector that appears once the upload is accepted
+        label: Name used in log messages
+        max_attempts: Number of attempts before giving up
+    """
     for attempt in range(1, max_attempts + 1):
         try:
-            print(f"📤 Upload attempt {attempt} for '{filename}'...")
-            await file_input.set_input_files(file_path)
+            log.info("📤 Upload attempt %s for '%s'...", attempt, label)
+            await file_input.set_input_files(files)
             
-            # Wait to confirm upload (adjust selector if needed)
-            await page.wait_for_selector(f"text='{filename}'", timeout=5000)
-            print(f"✅ File '{filename}' uploaded and detected on page!")
+            # Wait to confirm upload
+            await page.wait_for_selector(confirm_selector, timeout=5000)
+            log.info("✅ File '%s' uploaded and detected on page!", label)
             return  # Success, exit function
         
         except Exception as e:
-            print(f"⚠️ Upload attempt {attempt} failed: {e}")
+            log.warning("⚠️ Upload attempt %s failed: %s", attempt, e)
             if attempt == max_attempts:
-                print(f"❌ Upload failed after {max_attempts} attempts for '{filename}'")
+                log.error("❌ Upload failed after %s attempts for '%s'", max_attempts, label)
                 raise Exception(f"Upload failed: {str(e)}")
             await asyncio.sleep(1)  # Wait before retrying
 
-async def automate_play_console():
-    global session_status
-    
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True, args=["--no-sandbox", "--start-maximized"])
+async def upload_csv_from_static_file(page, filename, timeout=30000):
+    """
+    Upload CSV file from static folder, retrying up to 5 times if upload confirmation fails.
 
-        if os.path.exists(STORAGE_PATH):
-            print("✅ Found existing session, loading it...", flush=True)
-            context = await browser.new_context(storage_state=STORAGE_PATH, no_viewport=True)
-            page = await context.new_page()
-            
-            # Test if session is still valid
-            await page.goto("https://play.google.com/console/u/0/developers/8453266419614197800/", wait_until="domcontentloaded")
-            is_valid, message = await check_session_validity(page)
-            
-            if not is_valid:
-                session_status = {"valid": False, "message": message}
-                print(f"⚠️ Session is invalid: {message}", flush=True)
-                await page.close()
-                await context.close()
-                automation_queue.stop_processing()
-                automation_status["running"] = False
-                return
-            
-            session_status = {"valid": True, "message": "Session is valid"}
-            await page.close()
-        else:
-            print("🔓 No saved session, starting fresh...", flush=True)
-            session_status = {"valid": False, "message": "No session found, please log in"}
-            context = await browser.new_context(no_viewport=True)
-            page = await context.new_page()
-            await page.goto("https://play.google.com/console/u/0/developers/8453266419614197800/create-new-app", wait_until="domcontentloaded")
-            await wait_for_login(page)
-            await context.storage_state(path=STORAGE_PATH)
-            session_status = {"valid": True, "message": "New session created"}
-            await page.close()
+    Args:
+        page: Playwright page object
+        filename: Name of file in static folder
+        timeout: Maximum time to wait for file input (ms)
+    """
+    static_folder = os.path.join(os.getcwd(), 'static')
+    file_path = os.path.join(static_folder, filename)
 
-        print("🚀 Automation worker ready to process queue...", flush=True)
-        automation_queue.start_processing()
-        automation_status["running"] = True
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found in static folder: {filename}")
+    if not filename.lower().endswith('.csv'):
+        log.warning("⚠️ Warning: File '%s' may not be a CSV file", filename)
+
+    file_input = await get_file_input(page, timeout=timeout)
+    await upload_files_with_retries(page, file_input, file_path, f"text='{filename}'", filename)
+
+# Store listing assets
+# Per-app images live in assets/<app name>/ as icon.*, feature_graphic.* and a
+# screenshots/ folder; anything missing falls back to assets/_shared/. Images are
+# fitted to Play's requirements and cached by content hash in storage/asset_cache.
+ASSETS_DIR = os.path.join(os.getcwd(), "assets")
+# Off until the upload selectors below have passed check-selectors
+UPLOAD_LISTING_GRAPHICS = os.environ.get("GPC_UPLOAD_LISTING_GRAPHICS", "0") == "1"
+SHARED_ASSETS_FOLDER = "_shared"
+ASSET_CACHE_DIR = os.path.join(os.getcwd(), "storage", "asset_cache")
+ASSET_CACHE_VERSION = 1
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+ASSET_SPECS = {
+    "icon": {"size": (512, 512), "max_bytes": 1024 * 1024, "alpha": True},
+    "feature_graphic": {"size": (1024, 500), "max_bytes": 15 * 1024 * 1024, "alpha": False},
+    "phone_screenshots": {"min_side": 320, "max_side": 3840, "max_ratio": 2.0, "min_count": 2, "max_count": 8,
+                          "max_bytes": 8 * 1024 * 1024, "alpha": False},
+}
+# (file input, preview shown once the console accepts the upload) per asset kind.
+# Not yet confirmed against the live console: check them against a recorded page
+# with `python benchmarks/bench_helpers.py check-selectors`, override them with
+# GPC_STORE_LISTING_UPLOAD_SELECTORS='{"icon": ["<input>", "<preview>"]}', then
+# turn uploads on with GPC_UPLOAD_LISTING_GRAPHICS=1.
+STORE_LISTING_UPLOAD_SELECTORS = {
+    "icon": ("app-icon-upload input[type='file']", "app-icon-upload img"),
+    "feature_graphic": ("feature-graphic-upload input[type='file']", "feature-graphic-upload img"),
+    "phone_screenshots": ("phone-screenshots-upload input[type='file']", "phone-screenshots-upload img"),
+    **{kind: tuple(selectors) for kind, selectors in json.loads(os.environ.get("GPC_STORE_LISTING_UPLOAD_SELECTORS", "{}")).items()}
+}
 
-        while True:
-            next_app = automation_queue.get_next_app()
-            if not next_app:
-                print("⏳ Queue is empty, waiting...", flush=True)
-                await asyncio.sleep(5)
+def app_assets_folder(app_name):
+    """The app's own asset folder. Path separators in the name become "_", so
+    "Burger/Grill" uses assets/Burger_Grill and no name can point outside ASSETS_DIR."""
+    folder_name = re.sub(r"[\\/\0]", "_", app_name)
+    if not folder_name.strip("."):
+        folder_name = folder_name.replace(".", "_")
+    return os.path.join(ASSETS_DIR, folder_name)
+
+def find_listing_assets(app_name):
+    """Source image paths per asset kind for an app, falling back to the shared folder."""
+    assets = {}
+    for folder in (app_assets_folder(app_name), os.path.join(ASSETS_DIR, SHARED_ASSETS_FOLDER)):
+        if not os.path.isdir(folder):
+            continue
+        for kind in ("icon", "feature_graphic"):
+            if kind in assets:
                 continue
+            for extension in IMAGE_EXTENSIONS:
+                path = os.path.join(folder, kind + extension)
+                if os.path.isfile(path):
+                    assets[kind] = path
+                    break
+        screenshots_folder = os.path.join(folder, "screenshots")
+        if "phone_screenshots" not in assets and os.path.isdir(screenshots_folder):
+            screenshots = [
+                os.path.join(screenshots_folder, name) for name in sorted(os.listdir(screenshots_folder))
+                if name.lower().endswith(IMAGE_EXTENSIONS)
+            ]
+            if screenshots:
+                assets["phone_screenshots"] = screenshots
+    return assets
+
+def load_pillow():
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        raise Exception("Pillow is required to process store listing assets (pip install Pillow)")
+    return Image, ImageOps
+
+def validate_listing_assets(app_name):
+    """Check source images can be fitted to Play's requirements, reading headers only."""
+    if not UPLOAD_LISTING_GRAPHICS:
+        return []
+    # A nested folder spelled out by the name itself would be silently ignored
+    folder = app_assets_folder(app_name)
+    spelled_out = os.path.normpath(os.path.join(ASSETS_DIR, app_name))
+    if spelled_out != folder and spelled_out.startswith(ASSETS_DIR + os.sep) and os.path.isdir(spelled_out):
+        return [f"Assets for {app_name!r} are read from {os.path.relpath(folder, ASSETS_DIR)}, "
+                f"not {os.path.relpath(spelled_out, ASSETS_DIR)}"]
+
+    assets = find_listing_assets(app_name)
+    if not assets:
+        return []
+    try:
+        Image, _ = load_pillow()
+    except Exception as e:
+        return [str(e)]
+
+    errors = []
+    for kind, paths in assets.items():
+        spec = ASSET_SPECS[kind]
+        if kind == "phone_screenshots" and not spec["min_count"] <= len(paths) <= spec["max_count"]:
+            errors.append(f"{len(paths)} phone screenshots, Play needs {spec['min_count']}-{spec['max_count']}")
+        for path in paths if isinstance(paths, list) else [paths]:
+            try:
+                with Image.open(path) as image:
+                    width, height = image.size
+            except Exception as e:
+                errors.append(f"Cannot read {os.path.relpath(path, ASSETS_DIR)}: {e}")
+                continue
+            if "size" in spec:
+                if width < spec["size"][0] or height < spec["size"][1]:
+                    errors.append(f"{kind} {os.path.relpath(path, ASSETS_DIR)} is {width}x{height}, needs at least {spec['size'][0]}x{spec['size'][1]}")
+            elif max(width, height) / min(width, height) > spec["max_ratio"]:
+                errors.append(f"Screenshot {os.path.relpath(path, ASSETS_DIR)} is {width}x{height}, aspect ratio must be at most {spec['max_ratio']:g}:1")
+    return errors
+
+def prepare_listing_asset(source_path, kind):
+    """Fit one source image to its asset spec, returning the cached output path.
+
+    Output is keyed by the source's content hash, so an asset shared between apps
+    is only processed once.
+    """
+    with open(source_path, "rb") as f:
+        data = f.read()
+    key = f"{hashlib.sha256(data).hexdigest()}-{kind}-v{ASSET_CACHE_VERSION}"
+    for extension in (".png", ".jpg"):
+        cached = os.path.join(ASSET_CACHE_DIR, key + extension)
+        if os.path.exists(cached):
+            return cached
+
+    Image, ImageOps = load_pillow()
+    spec = ASSET_SPECS[kind]
+    image = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+    image = image.convert("RGBA" if spec["alpha"] else "RGB")
+    if "size" in spec:
+        image = ImageOps.fit(image, spec["size"], Image.LANCZOS)
+    else:
+        scale = 1.0
+        if max(image.size) > spec["max_side"]:
+            scale = spec["max_side"] / max(image.size)
+        elif min(image.size) < spec["min_side"]:
+            scale = spec["min_side"] / min(image.size)
+        if scale != 1.0:
+            image = image.resize((round(image.width * scale), round(image.height * scale)), Image.LANCZOS)
+
+    output = io.BytesIO()
+    image.save(output, "PNG", optimize=True)
+    extension = ".png"
+    if output.tell() > spec["max_bytes"] and not spec["alpha"]:
+        output = io.BytesIO()
+        image.save(output, "JPEG", quality=90)
+        extension = ".jpg"
+    if output.tell() > spec["max_bytes"]:
+        raise Exception(f"{kind} from {source_path} is still over {spec['max_bytes'] // 1024}KB after processing")
+
+    os.makedirs(ASSET_CACHE_DIR, exist_ok=True)
+    cached = os.path.join(ASSET_CACHE_DIR, key + extension)
+    tmp_path = f"{cached}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(output.getvalue())
+    os.replace(tmp_path, cached)
+    return cached
+
+def prepare_listing_assets(app_name):
+    """Processed, upload-ready file paths per asset kind for an app."""
+    prepared = {}
+    for kind, paths in find_listing_assets(app_name).items():
+        if isinstance(paths, list):
+            prepared[kind] = [prepare_listing_asset(path, kind) for path in paths[:ASSET_SPECS[kind]["max_count"]]]
+        else:
+            prepared[kind] = prepare_listing_asset(paths, kind)
+    return prepared
 
-            app_name = next_app['app_name']
-            page = await context.new_page()
+async def upload_store_listing_assets(page, run):
+    """Upload the app's graphics on the main store listing page, if
+    GPC_UPLOAD_LISTING_GRAPHICS is on.
 
-            try:
-                print(f"\n=== Processing app: {app_name} ===", flush=True)
-                await page.goto("https://play.google.com/console/u/0/developers/8453266419614197800/create-new-app", wait_until="domcontentloaded")
-                
-                # Check session again in case it expired during processing
-                is_valid, message = await check_session_validity(page)
-                if not is_valid:
-                    session_status = {"valid": False, "message": message}
-                    print(f"⚠️ Session expired during processing: {message}", flush=True)
-                    await page.close()
-                    automation_queue.stop_processing()
-                    automation_status["running"] = False
-                    return
-                
-                await page.wait_for_selector("#main-content", state="visible", timeout=DEFAULT_TIMEOUT)
-
-                input_xpath = '//*[@id="main-content"]/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/create-new-app-page/console-form/console-form-row[1]/div/div[2]/div[1]/material-input/label/input'
-                input_field = await page.wait_for_selector(f'xpath={input_xpath}', timeout=DEFAULT_TIMEOUT)
-                
-                await input_field.fill("")
-                await asyncio.sleep(0.5)
-                await input_field.fill(app_name)
-                await asyncio.sleep(0.5)
-
-                print(f"✅ App name '{app_name}' entered successfully.", flush=True)
-
-                await click_button_by_material_radio_debug_id(page, "app-radio")
-                print("Radio button 'app-radio' clicked.", flush=True)
-
-                await click_button_by_material_radio_debug_id(page, "free-radio")
-                print("Radio button 'free-radio' clicked.", flush=True)
-
-                # Check "guidelines-checkbox"
-                await click_checkbox_by_debug_id(page, "guidelines-checkbox")
-
-                # Check "export-laws-checkbox"
-                await click_checkbox_by_debug_id(page, "export-laws-checkbox")
-
-                # Create App button
-                try:
-                    async with page.expect_navigation(wait_until="load", timeout=300_000):
-                        await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/create-new-app-page/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div/material-button[1]/button/div[2]")
-                except Exception as e:
-                    print("❌ An error occurred:", e, flush=True)
-                    traceback.print_exc(file=sys.stdout)
+    Returns the asset kinds that could not be uploaded. Each failure is recorded
+    as a soft failure so the rest of the listing can still be saved, and the
+    step then fails the app (see step_store_listing).
+    """
+    app_name = run["app_name"]
+    if not UPLOAD_LISTING_GRAPHICS:
+        return []
+    if not find_listing_assets(app_name):
+        log.info("ℹ️ No store listing assets for '%s', skipping graphics", app_name)
+        return []
+    try:
+        # Image processing is CPU bound, keep it off the event loop
+        prepared = await asyncio.get_running_loop().run_in_executor(None, prepare_listing_assets, app_name)
+    except Exception as e:
+        soft_fail(run, f"Failed to prepare store listing assets: {e}")
+        return list(find_listing_assets(app_name))
 
-                # 🌟 Get current URL and extract the app_id
-                created_app_url = page.url
-                print(f"🌐 Created app URL: {created_app_url}", flush=True)
+    failed = []
+    for kind, files in prepared.items():
+        input_selector, preview_selector = STORE_LISTING_UPLOAD_SELECTORS[kind]
+        try:
+            file_input = await get_file_input(page, input_selector)
+            await upload_files_with_retries(page, file_input, files, preview_selector, f"{app_name} {kind}")
+        except Exception as e:
+            soft_fail(run, f"Failed to upload {kind}: {e}")
+            failed.append(kind)
+    return failed
+
+class SessionExpiredError(Exception):
+    pass
+
+# Step parameters, shared by the steps and the plan validators
+APP_NAME_MAX_LENGTH = 30
+SHORT_DESCRIPTION_MAX_LENGTH = 80
+FULL_DESCRIPTION_MAX_LENGTH = 4000
+DATA_SAFETY_CSV = "data_safety_export_Jan24.csv"
+DATA_SAFETY_CSV_COLUMNS = [
+    "Question ID (machine readable)",
+    "Response ID (machine readable)",
+    "Response value",
+    "Answer requirement",
+    "Human-friendly question label"
+]
+
+# Sent to Google's reviewers as-is; kept at column 0 so re-indenting the steps cannot change it
+TESTING_INSTRUCTIONS = """Use the demo account and PIN provided for logging into the app. Login authentication in the app is based on the user's phone number. PLEASE BE SURE TO REMOVE INITIAL +1 PREFIX.
 
-                # Extract app_id from URL
-                import re
-                match = re.search(r'/app/([^/]+)/', created_app_url)
-                if match:
-                    app_id = match.group(1)
-                    print(f"🆔 Extracted App ID: {app_id}", flush=True)
+PLACING AN ORDER:
 
-                # Privacy policy URL
-                await goto_app_section_until_success(page, app_id, "privacy-policy")
+PLEASE DO NOT PLACE THE ORDER - THIS IS A REAL LIVE RESTAURANT
 
-                # Flipdish privacy policy URL
-                input_xpath = "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-privacy-policy-page/div/console-block-1-column[2]/div/div/console-form/material-input/label/input"
-                text_field = await wait_for_element(page, f'xpath={input_xpath}')
-                await text_field.fill("https://www.flipdish.com/privacy-policy")     
+PAYMENT METHODS: screen has been designed to show information, it is not possible to modify, add or remove payment methods like Cash etc. This can only be done for payment cards. BANK CONTACT &IDEAL only for NL stores."""
 
-                # Save button
-                await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-privacy-policy-page/div/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[2]/overflowable-item[2]/button/span")
-                await asyncio.sleep(15)
+def short_description(app_name):
+    return "Amazing food delivered to your door!"
 
-                # App access URL
-                await goto_app_section_until_success(page, app_id, "testing-credentials")
+def full_description(app_name):
+    return f"{app_name} is committed to providing the best food and drink experience in your own home. Order online here at {app_name} or order from our app!"
 
-                # Login required
-                await click_button_by_console_form_expandable_debug_id(page, "login-required-expandable-section")
+# Automation steps, run in order for every app. Each step receives the page
+# and a `run` dict holding app_name, app_id, the name of the current step and
+# the soft failures recorded so far.
+def soft_fail(run, message, exc_info=False):
+    """Log a non-fatal failure and record it against the current step."""
+    log.warning(message, exc_info=exc_info)
+    run["soft_failures"].append({"step": run["step"], "message": message})
 
-                # Add instructions
-                await click_button_by_xpath(page, "/html/body/div[1]/root/console-chrome/div/div/div/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-testing-credentials-page/console-block-1-column/div/div/console-form/console-form-expandable-section[2]/div/expandable-container/div/div/console-button-set/div/button/material-icon/i")
+async def step_create_app(page, run):
+    app_name = run["app_name"]
+    await action_scheduler.acquire("navigation")
+    await page.goto(f"{CONSOLE_URL}/create-new-app", wait_until="domcontentloaded")
 
-                # Instructions
-                input_xpath = "//*[@id='default-acx-overlay-container']/div[2]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/console-block-1-column/div/div/console-form/console-form-row[1]/div/div[2]/div[1]/material-input/label/input"
-                text_field = await wait_for_element(page, f'xpath={input_xpath}')
-                await text_field.fill("For Testing")
+    # Check session again in case it expired during processing
+    is_valid, message = await check_session_validity(page)
+    if not is_valid:
+        raise SessionExpiredError(message)
 
-                input_xpath = "//*[@id='default-acx-overlay-container']/div[2]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/console-block-1-column/div/div/console-form/div/console-form-row[1]/div/div[2]/div[1]/material-input/label/input"
-                text_field = await wait_for_element(page, f'xpath={input_xpath}')
-                await text_field.fill("+481234567890")
+    await page.wait_for_selector("#main-content", state="visible", timeout=DEFAULT_TIMEOUT)
 
-                input_xpath = "//*[@id='default-acx-overlay-container']/div[2]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/console-block-1-column/div/div/console-form/div/console-form-row[2]/div/div[2]/div[1]/material-input/label/input"
-                text_field = await wait_for_element(page, f'xpath={input_xpath}')
-                await text_field.fill("7890")
+    input_xpath = '//*[@id="main-content"]/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/create-new-app-page/console-form/console-form-row[1]/div/div[2]/div[1]/material-input/label/input'
+    input_field = await page.wait_for_selector(f'xpath={input_xpath}', timeout=DEFAULT_TIMEOUT)
 
-                input_xpath = "//*[@id='default-acx-overlay-container']/div[2]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/console-block-1-column/div/div/console-form/div/console-block-3-1/div[1]/div/div/console-form-row/div/div/div[1]/material-input/label/span[2]/textarea"
-                text_field = await wait_for_element(page, f'xpath={input_xpath}')
-                await text_field.fill("""Use the demo account and PIN provided for logging into the app. Login authentication in the app is based on the user's phone number. PLEASE BE SURE TO REMOVE INITIAL +1 PREFIX.
+    await input_field.fill("")
+    await asyncio.sleep(0.5)
+    await input_field.fill(app_name)
+    await asyncio.sleep(0.5)
 
-PLACING AN ORDER:
+    log.info("✅ App name '%s' entered successfully.", app_name)
 
-PLEASE DO NOT PLACE THE ORDER - THIS IS A REAL LIVE RESTAURANT
+    await click_button_by_material_radio_debug_id(page, "app-radio")
+    log.debug("Radio button 'app-radio' clicked.")
 
-PAYMENT METHODS: screen has been designed to show information, it is not possible to modify, add or remove payment methods like Cash etc. This can only be done for payment cards. BANK CONTACT &IDEAL only for NL stores.""")
+    await click_button_by_material_radio_debug_id(page, "free-radio")
+    log.debug("Radio button 'free-radio' clicked.")
 
-                print("Instructions entered successfully.", flush=True)
+    # Check "guidelines-checkbox"
+    await click_checkbox_by_debug_id(page, "guidelines-checkbox")
 
-                # No additional information needed - Checkbox
-                await click_checkbox_by_debug_id(page, "no-additional-details-required-checkbox")
+    # Check "export-laws-checkbox"
+    await click_checkbox_by_debug_id(page, "export-laws-checkbox")
 
-                # Add
-                await click_button_by_xpath(page, "//*[@id='default-acx-overlay-container']/div[2]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div/button[1]/span")
+    # Create App button
+    try:
+        async with page.expect_navigation(wait_until="load", timeout=300_000):
+            await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/create-new-app-page/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div/material-button[1]/button/div[2]", action="save")
+    except Exception as e:
+        soft_fail(run, f"❌ An error occurred: {e}", exc_info=True)
 
-                # Save button
-                await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-testing-credentials-page/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[2]/overflowable-item[2]/button/span")
-                await asyncio.sleep(15)
+    # 🌟 Get current URL and extract the app_id
+    created_app_url = page.url
+    log.info("🌐 Created app URL: %s", created_app_url)
 
-                # Ads URL
-                await goto_app_section_until_success(page, app_id, "ads-declaration")
+    # Extract app_id from URL
+    match = re.search(r'/app/([^/]+)/', created_app_url)
+    if not match:
+        raise Exception(f"Could not extract app ID from {created_app_url}")
+    run["app_id"] = match.group(1)
+    log.info("🆔 Extracted App ID: %s", run['app_id'])
 
-                # No ads
-                await click_button_by_material_radio_group_debug_id(page, "contains-ads-radio-group", index=1)
+async def step_privacy_policy(page, run):
+    app_id = run["app_id"]
+    # Privacy policy URL
+    await goto_app_section_until_success(page, app_id, "privacy-policy")
 
-                # Save button
-                await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-ads-declaration-page/div/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[2]/overflowable-item[2]/button/span")
-                await asyncio.sleep(15)
+    # Flipdish privacy policy URL
+    input_xpath = "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-privacy-policy-page/div/console-block-1-column[2]/div/div/console-form/material-input/label/input"
+    text_field = await wait_for_element(page, f'xpath={input_xpath}')
+    await text_field.fill("https://www.flipdish.com/privacy-policy")     
 
-                # Content ratings URL
-                await goto_app_section_until_success(page, app_id, "content-rating-overview")
+    # Save button
+    await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-privacy-policy-page/div/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[2]/overflowable-item[2]/button/span", action="save")
+    await asyncio.sleep(15)
 
-                # Start questionnaire
-                try:
-                    xpath = "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-rating-overview-page/console-page-header/console-block-1-column/div/div/partner-program-get-started/get-started/div/div[1]/div/console-button-set/div[1]/button/span"
-                    await click_button_by_xpath(page, xpath)
-                except Exception as e:
-                    print(f"Failed to click the button: {e}")
+async def step_testing_credentials(page, run):
+    app_id = run["app_id"]
+    # App access URL
+    await goto_app_section_until_success(page, app_id, "testing-credentials")
 
-                # Email address
-                input_xpath = "/html/body/div[1]/root/console-chrome/div/div/div/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-rating-iarc-questionnaire-page/console-form/fill-questionnaire-flow/console-form/console-block-1-column/div/div/material-stepper/div[2]/div/app-category-step/console-section/div/div/console-block-1-column/div/div/console-form-row[1]/div/div[2]/div[1]/material-input/label/input"
-                input_field = await wait_for_element(page, f'xpath={input_xpath}')
-                await input_field.fill("help@flipdish.com")
+    # Login required
+    await click_button_by_console_form_expandable_debug_id(page, "login-required-expandable-section")
 
-                # Category
-                await click_button_by_material_radio_group_debug_id(page, "app-category-radio-group", index=2)
+    # Add instructions
+    await click_button_by_xpath(page, "/html/body/div[1]/root/console-chrome/div/div/div/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-testing-credentials-page/console-block-1-column/div/div/console-form/console-form-expandable-section[2]/div/expandable-container/div/div/console-button-set/div/button/material-icon/i")
 
-                # IARC Checkbox
-                await click_checkbox_by_debug_id(page, "iarc-tou-checkbox")
+    # Instructions
+    input_xpath = "//*[@id='default-acx-overlay-container']/div[2]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/console-block-1-column/div/div/console-form/console-form-row[1]/div/div[2]/div[1]/material-input/label/input"
+    text_field = await wait_for_element(page, f'xpath={input_xpath}')
+    await text_field.fill("For Testing")
 
-                # Next button
-                try:
-                    xpath = "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-rating-iarc-questionnaire-page/console-form/fill-questionnaire-flow/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[2]/overflowable-item/button/span"
-                    await click_button_by_xpath(page, xpath)
-                except Exception as e:
-                    print(f"Failed to click the button: {e}")
+    input_xpath = "//*[@id='default-acx-overlay-container']/div[2]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/console-block-1-column/div/div/console-form/div/console-form-row[1]/div/div[2]/div[1]/material-input/label/input"
+    text_field = await wait_for_element(page, f'xpath={input_xpath}')
+    await text_field.fill("+481234567890")
 
-                # All other app types
-                try:
-                    parent_containers = await page.locator("console-block-1-column[debug-id='question-category-title']").all()
-                    
-                    for parent_index, parent_container in enumerate(parent_containers):
-                        material_radio_groups = await parent_container.locator("material-radio-group[debug-id='single-response-radio-group']").all()
-                        
-                        if parent_index < 4:
-                            if material_radio_groups:
-                                await click_button_ingroup_by_material_radio_group_debug_id(
-                                    page, "question-category-title", parent_index, "single-response-radio-group", 0, 1
-                                )
-                        else:
-                            for i in range(5):
-                                if len(material_radio_groups) > i:
-                                    await click_button_ingroup_by_material_radio_group_debug_id(
-                                        page, "question-category-title", parent_index, "single-response-radio-group", i, 1
-                                    )
-                except Exception as e:
-                    print(f"Error clicking 'No' buttons: {e}")
-
-                # Save button
-                try:
-                    xpath = "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-rating-iarc-questionnaire-page/console-form/fill-questionnaire-flow/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[3]/overflowable-item[1]/button/span"
-                    await click_button_by_xpath(page, xpath)
-                except Exception as e:
-                    print(f"Failed to click the button: {e}")
-                await asyncio.sleep(10)
-                
-                # Next button
-                try:
-                    xpath = "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-rating-iarc-questionnaire-page/console-form/fill-questionnaire-flow/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[2]/overflowable-item/button/span"
-                    await click_button_by_xpath(page, xpath)
-                except Exception as e:
-                    print(f"Failed to click the button: {e}")
+    input_xpath = "//*[@id='default-acx-overlay-container']/div[2]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/console-block-1-column/div/div/console-form/div/console-form-row[2]/div/div[2]/div[1]/material-input/label/input"
+    text_field = await wait_for_element(page, f'xpath={input_xpath}')
+    await text_field.fill("7890")
 
-                # Save button
-                try:
-                    xpath = "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-rating-iarc-questionnaire-page/console-form/fill-questionnaire-flow/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[2]/overflowable-item[2]/button/span"
-                    await click_button_by_xpath(page, xpath)
-                except Exception as e:
-                    print(f"Failed to click the element: {e}")
-                await asyncio.sleep(15)           
+    input_xpath = "//*[@id='default-acx-overlay-container']/div[2]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/console-block-1-column/div/div/console-form/div/console-block-3-1/div[1]/div/div/console-form-row/div/div/div[1]/material-input/label/span[2]/textarea"
+    text_field = await wait_for_element(page, f'xpath={input_xpath}')
+    await text_field.fill(TESTING_INSTRUCTIONS)
 
-                # Target audience and content URL
-                await goto_app_section_until_success(page, app_id, "target-audience-content")
+    log.info("Instructions entered successfully.")
 
-                # Target age button
-                try:
-                    await click_checkbox_by_debug_id(page, "age-band-checkboxes", index=5)
-                except Exception as e:
-                    print(f"Failed to click the checkbox: {e}")
+    # No additional information needed - Checkbox
+    await click_checkbox_by_debug_id(page, "no-additional-details-required-checkbox")
 
-                # Next button
-                try:
-                    xpath = "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-target-audience-content-page/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div/button[1]/span"
-                    await click_button_by_xpath(page, xpath)
-                except Exception as e:
-                    print(f"Failed to click the button: {e}")
+    # Add
+    await click_button_by_xpath(page, "//*[@id='default-acx-overlay-container']/div[2]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div/button[1]/span")
 
-                # Save button
-                try:
-                    xpath = "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-target-audience-content-page/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[2]/overflowable-item[2]/button/span"
-                    await click_button_by_xpath(page, xpath)
-                except Exception as e:
-                    print(f"Failed to click the button: {e}")
-                await asyncio.sleep(15)                                
+    # Save button
+    await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-testing-credentials-page/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[2]/overflowable-item[2]/button/span", action="save")
+    await asyncio.sleep(15)
 
-                # Data safety URL
-                await goto_app_section_until_success(page, app_id, "data-privacy-security")
+async def step_ads_declaration(page, run):
+    app_id = run["app_id"]
+    # Ads URL
+    await goto_app_section_until_success(page, app_id, "ads-declaration")
 
-                # Import button
-                try:
-                    xpath = "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-play-safety-labels-page/console-page-header/div/div/div/console-header/div/div/div[1]/div[2]/div/div/console-button-set/div/button[2]/span"
-                    await click_button_by_xpath(page, xpath)
-                except Exception as e:
-                    print(f"Failed to click the element: {e}")
+    # No ads
+    await click_button_by_material_radio_group_debug_id(page, "contains-ads-radio-group", index=1)
 
-                # Upload file
-                await upload_csv_from_static_file(page, "data_safety_export_Jan24.csv")
+    # Save button
+    await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-ads-declaration-page/div/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[2]/overflowable-item[2]/button/span", action="save")
+    await asyncio.sleep(15)
 
-                # Import button
-                try:
-                    xpath = "//*[@id='default-acx-overlay-container']/div[3]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div/button[1]/span"
-                    await click_button_by_xpath(page, xpath)
-                except Exception as e:
-                    print(f"Failed to click the element: {e}")
+async def step_content_rating(page, run):
+    app_id = run["app_id"]
+    # Content ratings URL
+    await goto_app_section_until_success(page, app_id, "content-rating-overview")
 
-                # Import button
-                try:
-                    xpath = "//*[@id='default-acx-overlay-container']/div[4]/material-dialog/focus-trap/div[2]/div/footer/div/div/console-button-set/div/button[2]/span"
-                    await click_button_by_xpath(page, xpath)
-                except Exception as e:
-                    print(f"Failed to click the element: {e}")
+    # Start questionnaire
+    try:
+        xpath = "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-rating-overview-page/console-page-header/console-block-1-column/div/div/partner-program-get-started/get-started/div/div[1]/div/console-button-set/div[1]/button/span"
+        await click_button_by_xpath(page, xpath)
+    except Exception as e:
+        soft_fail(run, f"Failed to click the button: {e}")
 
-                # Next Buttons
-                try:
-                    await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-play-safety-labels-page/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[1]/button/span")
-                except Exception as e:
-                    print(f"Failed to click the element: {e}")
-                await asyncio.sleep(5)
+    # Email address
+    input_xpath = "/html/body/div[1]/root/console-chrome/div/div/div/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-rating-iarc-questionnaire-page/console-form/fill-questionnaire-flow/console-form/console-block-1-column/div/div/material-stepper/div[2]/div/app-category-step/console-section/div/div/console-block-1-column/div/div/console-form-row[1]/div/div[2]/div[1]/material-input/label/input"
+    input_field = await wait_for_element(page, f'xpath={input_xpath}')
+    await input_field.fill("help@flipdish.com")
 
-                try:
-                    await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-play-safety-labels-page/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[1]/button/span")
-                except Exception as e:
-                    print(f"Failed to click the element: {e}")
-                await asyncio.sleep(5)
+    # Category
+    await click_button_by_material_radio_group_debug_id(page, "app-category-radio-group", index=2)
 
-                try:
-                    await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-play-safety-labels-page/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[1]/button/span")
-                except Exception as e:
-                    print(f"Failed to click the element: {e}")
-                await asyncio.sleep(5)
+    # IARC Checkbox
+    await click_checkbox_by_debug_id(page, "iarc-tou-checkbox")
 
-                # Save button
-                try:
-                    await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-play-safety-labels-page/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[3]/overflowable-item[3]/button/span")
-                except Exception as e:
-                    print(f"Failed to click the element: {e}")
-                await asyncio.sleep(15)
+    # Next button
+    try:
+        xpath = "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-rating-iarc-questionnaire-page/console-form/fill-questionnaire-flow/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[2]/overflowable-item/button/span"
+        await click_button_by_xpath(page, xpath)
+    except Exception as e:
+        soft_fail(run, f"Failed to click the button: {e}")
 
-                # Government app URL
-                await goto_app_section_until_success(page, app_id, "government-apps")
+    # All other app types
+    try:
+        parent_containers = await page.locator("console-block-1-column[debug-id='question-category-title']").all()
 
-                # No government app button
-                await click_button_by_material_radio_debug_id(page, "no-radio")
-                print("Radio button 'no-radio' clicked.")
+        for parent_index, parent_container in enumerate(parent_containers):
+            material_radio_groups = await parent_container.locator("material-radio-group[debug-id='single-response-radio-group']").all()
 
-                # Save button
-                try:
-                    await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-government-apps-page/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[2]/overflowable-item[2]/button/span")
-                except Exception as e:
-                    print(f"Failed to click the element: {e}")
-                await asyncio.sleep(15)
+            if parent_index < 4:
+                if material_radio_groups:
+                    await click_button_ingroup_by_material_radio_group_debug_id(
+                        page, "question-category-title", parent_index, "single-response-radio-group", 0, 1
+                    )
+            else:
+                for i in range(5):
+                    if len(material_radio_groups) > i:
+                        await click_button_ingroup_by_material_radio_group_debug_id(
+                            page, "question-category-title", parent_index, "single-response-radio-group", i, 1
+                        )
+    except Exception as e:
+        soft_fail(run, f"Error clicking 'No' buttons: {e}")
 
-                # Financial features URL
-                await goto_app_section_until_success(page, app_id, "financial-features")
+    # Save button
+    try:
+        xpath = "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-rating-iarc-questionnaire-page/console-form/fill-questionnaire-flow/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[3]/overflowable-item[1]/button/span"
+        await click_button_by_xpath(page, xpath, action="save")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the button: {e}")
+    await asyncio.sleep(10)
 
-                # Financial features in your app
-                try:
-                    await click_checkbox_by_debug_id(page, "none-response")
-                except Exception as e:
-                    print(f"Failed to click the checkbox: {e}")
+    # Next button
+    try:
+        xpath = "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-rating-iarc-questionnaire-page/console-form/fill-questionnaire-flow/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[2]/overflowable-item/button/span"
+        await click_button_by_xpath(page, xpath)
+    except Exception as e:
+        soft_fail(run, f"Failed to click the button: {e}")
 
-                # Next button
-                try:
-                    await click_button_by_xpath(page, "/html/body/div[1]/root/console-chrome/div/div/div/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-finance-declaration-page/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[1]/button/span")
-                except Exception as e:
-                    print(f"Failed to click the element: {e}")
+    # Save button
+    try:
+        xpath = "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-rating-iarc-questionnaire-page/console-form/fill-questionnaire-flow/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[2]/overflowable-item[2]/button/span"
+        await click_button_by_xpath(page, xpath, action="save")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the element: {e}")
+    await asyncio.sleep(15)           
 
-                # Save button
-                try:
-                    await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-finance-declaration-page/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[3]/overflowable-item[3]/button/span")
-                except Exception as e:
-                    print(f"Failed to click the element: {e}")
-                await asyncio.sleep(15)
+async def step_target_audience_content(page, run):
+    app_id = run["app_id"]
+    # Target audience and content URL
+    await goto_app_section_until_success(page, app_id, "target-audience-content")
 
-                # Health apps URL
-                await goto_app_section_until_success(page, app_id, "health")
+    # Target age button
+    try:
+        await click_checkbox_by_debug_id(page, "age-band-checkboxes", index=5)
+    except Exception as e:
+        soft_fail(run, f"Failed to click the checkbox: {e}")
 
-                # App features button
-                try:
-                    await click_checkbox_by_debug_id(page, "POLICY_RESPONSE_CHOICE_ID_NOT_HEALTH_APP")
-                except Exception as e:
-                    print(f"Failed to click the checkbox: {e}")
+    # Next button
+    try:
+        xpath = "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-target-audience-content-page/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div/button[1]/span"
+        await click_button_by_xpath(page, xpath)
+    except Exception as e:
+        soft_fail(run, f"Failed to click the button: {e}")
 
-                # Save button
-                try:
-                    await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-health-page/policy-declaration/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[2]/overflowable-item[2]/button/span")
-                except Exception as e:
-                    print(f"Failed to click the element: {e}")
-                await asyncio.sleep(15)
-
-                # Dashboard button
-                try:                
-                    async with page.expect_navigation(wait_until="load", timeout=300_000):
-                        await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-health-page/console-page-header/div/div/div/console-button-set/div/a/material-icon/i")
-                except Exception as e:
-                    print("❌ An error occurred:", e, flush=True)
-                    traceback.print_exc(file=sys.stdout)
-
-                # Store settings button
-                try:                
-                    async with page.expect_navigation(wait_until="load", timeout=300_000):
-                        await click_button_by_xpath(page, "/html/body/div[1]/root/console-chrome/div/div/div/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-dashboard-page/console-section[2]/div/div/console-block-1-column/div/div/setup-goal/goal/div/div[2]/expandable-area/expandable-container/div/div/div/div/task-group[2]/div[2]/div/task[1]/div/div[2]/div/material-icon/i")
-                except Exception as e:
-                    print("❌ An error occurred:", e, flush=True)
-                    traceback.print_exc(file=sys.stdout)
-
-                # Edit button
-                try:
-                    await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/store-settings-page/console-form/console-section[1]/div/console-header/div/div/div[1]/div[2]/div/console-button-set/div/material-button/button/div[2]")
-                except Exception as e:
-                    print(f"Failed to click the element: {e}")
+    # Save button
+    try:
+        xpath = "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-target-audience-content-page/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[2]/overflowable-item[2]/button/span"
+        await click_button_by_xpath(page, xpath, action="save")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the button: {e}")
+    await asyncio.sleep(15)                                
 
-                # App category button
-                try:
-                    await click_button_by_xpath(page, "/html/body/div[2]/div[3]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/console-block-1-column/div/div/console-form-row[2]/div/div[2]/div[1]/material-dropdown-select/dropdown-button/div/material-icon/i")
-                except Exception as e:
-                    print(f"Failed to click the element: {e}")
+async def step_data_privacy_security(page, run):
+    app_id = run["app_id"]
+    # Data safety URL
+    await goto_app_section_until_success(page, app_id, "data-privacy-security")
 
-                # Food & drink button
-                try:
-                    await click_button_by_xpath(page, "/html/body/div[2]/div[5]/div/div/div[2]/div[2]/material-list/div/div/material-select-dropdown-item[13]/span")
-                except Exception as e:
-                    print(f"Failed to click the element: {e}")
+    # Import button
+    try:
+        xpath = "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-play-safety-labels-page/console-page-header/div/div/div/console-header/div/div/div[1]/div[2]/div/div/console-button-set/div/button[2]/span"
+        await click_button_by_xpath(page, xpath)
+    except Exception as e:
+        soft_fail(run, f"Failed to click the element: {e}")
 
-                # Save button
-                try:
-                    await click_button_by_xpath(page, "//*[@id='default-acx-overlay-container']/div[3]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[2]/overflowable-item[2]/button/span")
-                except Exception as e:
-                    print(f"Failed to click the element: {e}")
-                await asyncio.sleep(5)
+    # Upload file
+    await upload_csv_from_static_file(page, DATA_SAFETY_CSV)
 
-                # Cross button
-                try:
-                    await click_button_by_xpath(page, "/html/body/div[2]/div[3]/div/focus-trap/div[2]/relative-popup/div/span/div/div[1]/div/button/i")
-                except Exception as e:
-                    print(f"Failed to click the button: {e}")
+    # Import button
+    try:
+        xpath = "//*[@id='default-acx-overlay-container']/div[3]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div/button[1]/span"
+        await click_button_by_xpath(page, xpath)
+    except Exception as e:
+        soft_fail(run, f"Failed to click the element: {e}")
 
-                # Manage tags button
-                try:
-                    await click_button_by_xpath(page, "/html/body/div[1]/root/console-chrome/div/div/div/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/store-settings-page/console-form/console-section[1]/div/div/console-block-1-column/div/div/crispr/console-form-row/div/div[2]/div[1]/console-button-set/div/material-button")
-                    print("Button clicked successfully.")
-                except Exception as e:
-                    print(f"Failed to click the button: {e}")
+    # Import button
+    try:
+        xpath = "//*[@id='default-acx-overlay-container']/div[4]/material-dialog/focus-trap/div[2]/div/footer/div/div/console-button-set/div/button[2]/span"
+        await click_button_by_xpath(page, xpath)
+    except Exception as e:
+        soft_fail(run, f"Failed to click the element: {e}")
 
-                try:
-                    await click_button_by_xpath(page, "/html/body/div[2]/div[2]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/console-block-1-column[2]/div/div/console-table/div/div/ess-table/ess-particle-table/div[1]/div/div[2]/div[34]/console-table-tools-cell/div/mat-checkbox")
-                    print("Checkbox clicked successfully.")
-                except Exception as e:
-                    print(f"Failed to click the checkbox: {e}")
+    # Next Buttons
+    try:
+        await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-play-safety-labels-page/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[1]/button/span")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the element: {e}")
+    await asyncio.sleep(5)
 
-                try:
-                    await click_button_by_xpath(page, "/html/body/div[2]/div[2]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/console-block-1-column[2]/div/div/console-table/div/div/ess-table/ess-particle-table/div[1]/div/div[2]/div[46]/console-table-tools-cell/div/mat-checkbox")
-                    print("Checkbox clicked successfully.")
-                except Exception as e:
-                    print(f"Failed to click the checkbox: {e}")
+    try:
+        await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-play-safety-labels-page/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[1]/button/span")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the element: {e}")
+    await asyncio.sleep(5)
 
-                try:
-                    xpath = "/html/body/div[2]/div[2]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/console-block-1-column[2]/div/div/console-table/div/div/ess-table/ess-particle-table/div[1]/div/div[2]/div[47]/console-table-tools-cell/div/mat-checkbox"
-                    await click_button_by_xpath(page, xpath)
-                    print("Checkbox clicked successfully.")
-                except Exception as e:
-                    print(f"Failed to click the checkbox: {e}")
+    try:
+        await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-play-safety-labels-page/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[1]/button/span")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the element: {e}")
+    await asyncio.sleep(5)
 
-                try:
-                    xpath = "/html/body/div[2]/div[2]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/console-block-1-column[2]/div/div/console-table/div/div/ess-table/ess-particle-table/div[1]/div/div[2]/div[69]/console-table-tools-cell/div/mat-checkbox"
-                    await click_button_by_xpath(page, xpath)
-                    print("Checkbox clicked successfully.")
-                except Exception as e:
-                    print(f"Failed to click the checkbox: {e}")
+    # Save button
+    try:
+        await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-play-safety-labels-page/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[3]/overflowable-item[3]/button/span", action="save")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the element: {e}")
+    await asyncio.sleep(15)
 
-                try:
-                    xpath = "/html/body/div[2]/div[2]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/console-block-1-column[2]/div/div/console-table/div/div/ess-table/ess-particle-table/div[1]/div/div[2]/div[115]/console-table-tools-cell/div/mat-checkbox"
-                    await click_button_by_xpath(page, xpath)
-                    print("Checkbox clicked successfully.")
-                except Exception as e:
-                    print(f"Failed to click the checkbox: {e}")
+async def step_government_apps(page, run):
+    app_id = run["app_id"]
+    # Government app URL
+    await goto_app_section_until_success(page, app_id, "government-apps")
 
-                # Apply button
-                try:
-                    xpath = "//*[@id='default-acx-overlay-container']/div[2]/div/focus-trap/div[2]/relative-popup/div/span/div/div[3]/div/console-button-set/div/button[2]/span"
-                    await click_button_by_xpath(page, xpath)
-                    print("Button clicked successfully.")
-                except Exception as e:
-                    print(f"Failed to click the button: {e}")
+    # No government app button
+    await click_button_by_material_radio_debug_id(page, "no-radio")
+    log.debug("Radio button 'no-radio' clicked.")
 
-                # Edit button
-                try:
-                    await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/store-settings-page/console-form/console-section[2]/div/console-header/div/div/div[1]/div[2]/div/console-button-set/div/material-button/button/div[2]")
-                except Exception as e:
-                    print(f"Failed to click the element: {e}")
+    # Save button
+    try:
+        await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-government-apps-page/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[2]/overflowable-item[2]/button/span", action="save")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the element: {e}")
+    await asyncio.sleep(15)
 
-                # Fill email field
-                input_xpath = "//*[@id='default-acx-overlay-container']/div[4]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/console-block-1-column/div/div/console-form-row[1]/div/div[2]/div[1]/material-input/label/input"
-                input_field = await wait_for_element(page, f'xpath={input_xpath}')
-                await input_field.fill("help@flipdish.com")
+async def step_financial_features(page, run):
+    app_id = run["app_id"]
+    # Financial features URL
+    await goto_app_section_until_success(page, app_id, "financial-features")
 
-                # Save button
-                try:
-                    await click_button_by_xpath(page, "//*[@id='default-acx-overlay-container']/div[4]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[2]/overflowable-item[2]/button/span")
-                except Exception as e:
-                    print(f"Failed to click the element: {e}")
-                await asyncio.sleep(5)
+    # Financial features in your app
+    try:
+        await click_checkbox_by_debug_id(page, "none-response")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the checkbox: {e}")
 
-                # Cross button
-                try:
-                    await click_button_by_xpath(page, "//*[@id='default-acx-overlay-container']/div[4]/div/focus-trap/div[2]/relative-popup/div/span/div/div[1]/div/button/i")
-                except Exception as e:
-                    print(f"Failed to click the button: {e}")                    
+    # Next button
+    try:
+        await click_button_by_xpath(page, "/html/body/div[1]/root/console-chrome/div/div/div/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-finance-declaration-page/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[1]/button/span")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the element: {e}")
 
-                # Store listings button
-                try:
-                    await click_button_by_xpath(page, "/html/body/div[1]/root/console-chrome/div/material-drawer[2]/navigation/nav/div/div[6]/navigation-item/div/expandable-container/div/div/navigation-item[1]/div/expandable-container/div/div/navigation-item[1]/div/a/span")
-                except Exception as e:
-                    print(f"Failed to click the button: {e}")
+    # Save button
+    try:
+        await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-finance-declaration-page/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[3]/overflowable-item[3]/button/span", action="save")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the element: {e}")
+    await asyncio.sleep(15)
 
-                # Store listings button
-                try:
-                    await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/custom-store-listings-overview-page/console-block-1-column/div/div/partner-program-get-started/get-started/div/div[1]/div/console-button-set/div/button[1]/span")
-                except Exception as e:
-                    print(f"Failed to click the button: {e}")
+async def step_health(page, run):
+    app_id = run["app_id"]
+    # Health apps URL
+    await goto_app_section_until_success(page, app_id, "health")
 
-                input_xpath = "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/main-store-listing-page/listing-localizations/localization-section/div/div[2]/localized-listing/console-block-1-column[3]/div/div/console-form/console-form-row[2]/div/div[2]/div[1]/localized-text-input/div/div/material-input/label/input"
-                input_field = await wait_for_element(page, f'xpath={input_xpath}')
-                await input_field.fill("Amazing food delivered to your door!")
+    # App features button
+    try:
+        await click_checkbox_by_debug_id(page, "POLICY_RESPONSE_CHOICE_ID_NOT_HEALTH_APP")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the checkbox: {e}")
 
-                input_xpath = "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/main-store-listing-page/listing-localizations/localization-section/div/div[2]/localized-listing/console-block-1-column[3]/div/div/console-form/console-form-row[3]/div/div[2]/div[1]/localized-text-input/div/div/material-input/label/span[2]/textarea"
-                input_field = await wait_for_element(page, f'xpath={input_xpath}')
-                await input_field.fill(f"{app_name} is committed to providing the best food and drink experience in your own home. Order online here at {app_name} or order from our app!")
+    # Save button
+    try:
+        await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-health-page/policy-declaration/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[2]/overflowable-item[2]/button/span", action="save")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the element: {e}")
+    await asyncio.sleep(15)
+
+async def step_store_settings(page, run):
+    # Dashboard button
+    try:                
+        async with page.expect_navigation(wait_until="load", timeout=300_000):
+            await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-content-health-page/console-page-header/div/div/div/console-button-set/div/a/material-icon/i", action="navigation")
+    except Exception as e:
+        soft_fail(run, f"❌ An error occurred: {e}", exc_info=True)
 
-                # Save as draft button
-                try:
-                    await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/main-store-listing-page/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[3]/overflowable-item[1]/button/span")
-                except Exception as e:
-                    print(f"Failed to click the button: {e}")
+    # Store settings button
+    try:                
+        async with page.expect_navigation(wait_until="load", timeout=300_000):
+            await click_button_by_xpath(page, "/html/body/div[1]/root/console-chrome/div/div/div/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/app-dashboard-page/console-section[2]/div/div/console-block-1-column/div/div/setup-goal/goal/div/div[2]/expandable-area/expandable-container/div/div/div/div/task-group[2]/div[2]/div/task[1]/div/div[2]/div/material-icon/i", action="navigation")
+    except Exception as e:
+        soft_fail(run, f"❌ An error occurred: {e}", exc_info=True)
+
+    # Edit button
+    try:
+        await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/store-settings-page/console-form/console-section[1]/div/console-header/div/div/div[1]/div[2]/div/console-button-set/div/material-button/button/div[2]")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the element: {e}")
+
+    # App category button
+    try:
+        await click_button_by_xpath(page, "/html/body/div[2]/div[3]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/console-block-1-column/div/div/console-form-row[2]/div/div[2]/div[1]/material-dropdown-select/dropdown-button/div/material-icon/i")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the element: {e}")
+
+    # Food & drink button
+    try:
+        await click_button_by_xpath(page, "/html/body/div[2]/div[5]/div/div/div[2]/div[2]/material-list/div/div/material-select-dropdown-item[13]/span")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the element: {e}")
+
+    # Save button
+    try:
+        await click_button_by_xpath(page, "//*[@id='default-acx-overlay-container']/div[3]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[2]/overflowable-item[2]/button/span", action="save")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the element: {e}")
+    await asyncio.sleep(5)
+
+    # Cross button
+    try:
+        await click_button_by_xpath(page, "/html/body/div[2]/div[3]/div/focus-trap/div[2]/relative-popup/div/span/div/div[1]/div/button/i")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the button: {e}")
+
+    # Manage tags button
+    try:
+        await click_button_by_xpath(page, "/html/body/div[1]/root/console-chrome/div/div/div/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/store-settings-page/console-form/console-section[1]/div/div/console-block-1-column/div/div/crispr/console-form-row/div/div[2]/div[1]/console-button-set/div/material-button")
+        log.debug("Button clicked successfully.")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the button: {e}")
+
+    try:
+        await click_button_by_xpath(page, "/html/body/div[2]/div[2]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/console-block-1-column[2]/div/div/console-table/div/div/ess-table/ess-particle-table/div[1]/div/div[2]/div[34]/console-table-tools-cell/div/mat-checkbox")
+        log.debug("Checkbox clicked successfully.")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the checkbox: {e}")
+
+    try:
+        await click_button_by_xpath(page, "/html/body/div[2]/div[2]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/console-block-1-column[2]/div/div/console-table/div/div/ess-table/ess-particle-table/div[1]/div/div[2]/div[46]/console-table-tools-cell/div/mat-checkbox")
+        log.debug("Checkbox clicked successfully.")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the checkbox: {e}")
+
+    try:
+        xpath = "/html/body/div[2]/div[2]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/console-block-1-column[2]/div/div/console-table/div/div/ess-table/ess-particle-table/div[1]/div/div[2]/div[47]/console-table-tools-cell/div/mat-checkbox"
+        await click_button_by_xpath(page, xpath)
+        log.debug("Checkbox clicked successfully.")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the checkbox: {e}")
+
+    try:
+        xpath = "/html/body/div[2]/div[2]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/console-block-1-column[2]/div/div/console-table/div/div/ess-table/ess-particle-table/div[1]/div/div[2]/div[69]/console-table-tools-cell/div/mat-checkbox"
+        await click_button_by_xpath(page, xpath)
+        log.debug("Checkbox clicked successfully.")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the checkbox: {e}")
+
+    try:
+        xpath = "/html/body/div[2]/div[2]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/console-block-1-column[2]/div/div/console-table/div/div/ess-table/ess-particle-table/div[1]/div/div[2]/div[115]/console-table-tools-cell/div/mat-checkbox"
+        await click_button_by_xpath(page, xpath)
+        log.debug("Checkbox clicked successfully.")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the checkbox: {e}")
 
-                print(f"✅ App '{app_name}' processed and removed from queue.", flush=True)
+    # Apply button
+    try:
+        xpath = "//*[@id='default-acx-overlay-container']/div[2]/div/focus-trap/div[2]/relative-popup/div/span/div/div[3]/div/console-button-set/div/button[2]/span"
+        await click_button_by_xpath(page, xpath)
+        log.debug("Button clicked successfully.")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the button: {e}")
 
-            except PlaywrightTimeoutError as e:
-                print(f"🔥 Timeout for '{app_name}': {e}", flush=True)
+    # Edit button
+    try:
+        await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/store-settings-page/console-form/console-section[2]/div/console-header/div/div/div[1]/div[2]/div/console-button-set/div/material-button/button/div[2]")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the element: {e}")
+
+    # Fill email field
+    input_xpath = "//*[@id='default-acx-overlay-container']/div[4]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/console-block-1-column/div/div/console-form-row[1]/div/div[2]/div[1]/material-input/label/input"
+    input_field = await wait_for_element(page, f'xpath={input_xpath}')
+    await input_field.fill("help@flipdish.com")
+
+    # Save button
+    try:
+        await click_button_by_xpath(page, "//*[@id='default-acx-overlay-container']/div[4]/div/focus-trap/div[2]/relative-popup/div/span/div/div[2]/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[2]/overflowable-item[2]/button/span", action="save")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the element: {e}")
+    await asyncio.sleep(5)
+
+    # Cross button
+    try:
+        await click_button_by_xpath(page, "//*[@id='default-acx-overlay-container']/div[4]/div/focus-trap/div[2]/relative-popup/div/span/div/div[1]/div/button/i")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the button: {e}")
+
+async def step_store_listing(page, run):
+    app_name = run["app_name"]
+    # Store listings button
+    try:
+        await click_button_by_xpath(page, "/html/body/div[1]/root/console-chrome/div/material-drawer[2]/navigation/nav/div/div[6]/navigation-item/div/expandable-container/div/div/navigation-item[1]/div/expandable-container/div/div/navigation-item[1]/div/a/span")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the button: {e}")
+
+    # Store listings button
+    try:
+        await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/custom-store-listings-overview-page/console-block-1-column/div/div/partner-program-get-started/get-started/div/div[1]/div/console-button-set/div/button[1]/span")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the button: {e}")
+
+    input_xpath = "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/main-store-listing-page/listing-localizations/localization-section/div/div[2]/localized-listing/console-block-1-column[3]/div/div/console-form/console-form-row[2]/div/div[2]/div[1]/localized-text-input/div/div/material-input/label/input"
+    input_field = await wait_for_element(page, f'xpath={input_xpath}')
+    await input_field.fill(short_description(app_name))
+
+    input_xpath = "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/main-store-listing-page/listing-localizations/localization-section/div/div[2]/localized-listing/console-block-1-column[3]/div/div/console-form/console-form-row[3]/div/div[2]/div[1]/localized-text-input/div/div/material-input/label/span[2]/textarea"
+    input_field = await wait_for_element(page, f'xpath={input_xpath}')
+    await input_field.fill(full_description(app_name))
+
+    # Graphics
+    failed_assets = await upload_store_listing_assets(page, run)
+
+    # Save as draft button
+    try:
+        await click_button_by_xpath(page, "//*[@id='main-content']/div[1]/div/div[1]/page-router-outlet/page-wrapper/div/main-store-listing-page/publishing-bottom-bar/form-bottom-bar/bottom-bar-base/div/div/div/div[2]/console-button-set/div[3]/overflowable-item[1]/button/span", action="save")
+    except Exception as e:
+        soft_fail(run, f"Failed to click the button: {e}")
+
+    # The text is saved either way, but a listing missing graphics is not finished
+    if failed_assets:
+        raise Exception(f"Store listing graphics not uploaded: {', '.join(failed_assets)}")
+
+# Plan validators. `validate` checks one app's parameters and `preflight`
+# checks resources shared by the whole batch; both return a list of errors.
+def validate_app_name(app_name):
+    if len(app_name) > APP_NAME_MAX_LENGTH:
+        return [f"App name is {len(app_name)} characters, the limit is {APP_NAME_MAX_LENGTH}"]
+    return []
+
+def preflight_data_safety_csv():
+    file_path = os.path.join(os.getcwd(), 'static', DATA_SAFETY_CSV)
+    if not os.path.exists(file_path):
+        return [f"Data safety CSV not found in static folder: {DATA_SAFETY_CSV}"]
+    try:
+        with open(file_path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            row_count = sum(1 for row in reader if any(row))
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        return [f"Data safety CSV could not be read: {e}"]
+    missing = [column for column in DATA_SAFETY_CSV_COLUMNS if column not in header]
+    errors = [f"Data safety CSV is missing column '{column}'" for column in missing]
+    if not row_count:
+        errors.append("Data safety CSV has no answers")
+    return errors
+
+def validate_store_listing(app_name):
+    errors = validate_listing_assets(app_name)
+    if len(short_description(app_name)) > SHORT_DESCRIPTION_MAX_LENGTH:
+        errors.append(f"Short description exceeds {SHORT_DESCRIPTION_MAX_LENGTH} characters")
+    if len(full_description(app_name)) > FULL_DESCRIPTION_MAX_LENGTH:
+        errors.append(f"Full description exceeds {FULL_DESCRIPTION_MAX_LENGTH} characters")
+    return errors
+
+# default_seconds is the runtime estimate used until the ledger has timings for a step
+AutomationStep = namedtuple("AutomationStep", ["name", "run", "default_seconds", "validate", "preflight"], defaults=(None, None))
+
+AUTOMATION_STEPS = [
+    AutomationStep("create-app", step_create_app, 60, validate=validate_app_name),
+    AutomationStep("privacy-policy", step_privacy_policy, 30),
+    AutomationStep("testing-credentials", step_testing_credentials, 45),
+    AutomationStep("ads-declaration", step_ads_declaration, 30),
+    AutomationStep("content-rating", step_content_rating, 90),
+    AutomationStep("target-audience-content", step_target_audience_content, 40),
+    AutomationStep("data-privacy-security", step_data_privacy_security, 75, preflight=preflight_data_safety_csv),
+    AutomationStep("government-apps", step_government_apps, 30),
+    AutomationStep("financial-features", step_financial_features, 35),
+    AutomationStep("health", step_health, 30),
+    AutomationStep("store-settings", step_store_settings, 60),
+    AutomationStep("store-listing", step_store_listing, 60, validate=validate_store_listing),
+]
+
+def plan_automation(app_names, allow_existing=False):
+    """Validate a batch against the step definitions and estimate its runtime, without a browser.
+
+    Names already created successfully, queued or in flight are errors, since
+    running them again creates a second console app, unless `allow_existing` is
+    set. Names whose earlier run failed after create-app are resumed with their
+    recorded console app id (returned in resume_app_ids) rather than created again.
+    """
+    averages = result_ledger.average_step_durations()
+    steps = []
+    for step in AUTOMATION_STEPS:
+        if step.name in averages:
+            steps.append({"name": step.name, "estimated_seconds": round(averages[step.name], 1), "source": "history"})
+        else:
+            steps.append({"name": step.name, "estimated_seconds": step.default_seconds, "source": "default"})
+    seconds_per_app = sum(step["estimated_seconds"] for step in steps)
+
+    errors = []
+    for step in AUTOMATION_STEPS:
+        if step.preflight:
+            errors.extend(f"{step.name}: {error}" for error in step.preflight())
+
+    succeeded = set(result_ledger.succeeded_app_names(app_names))
+    created = result_ledger.created_app_ids(app_names)
+    queued = {item['app_name'] for item in automation_queue.get_status()['queue_list']}
+    in_flight = worker_control.get_status()['current_app']
+    resume_app_ids = {}
+    seen = set()
+    apps = []
+    for app_name in app_names:
+        app_errors = [
+            f"{step.name}: {error}"
+            for step in AUTOMATION_STEPS if step.validate
+            for error in step.validate(app_name)
+        ]
+        warnings = []
+        if app_name in seen:
+            app_errors.append("Duplicate app name in this batch")
+        existing = None
+        if app_name in succeeded:
+            existing = "An app with this name was already created successfully"
+        elif app_name == in_flight:
+            existing = "An app with this name is being processed right now"
+        elif app_name in queued:
+            existing = "An app with this name is already queued"
+        elif app_name in created:
+            resume_app_ids[app_name] = created[app_name]
+            warnings.append(f"An earlier run created console app {created[app_name]}; it will be resumed after create-app")
+        if existing:
+            if allow_existing:
+                warnings.append(existing)
+            else:
+                app_errors.append(f"{existing} (set allow_existing to create it again)")
+        seen.add(app_name)
+        apps.append({"app_name": app_name, "errors": app_errors, "warnings": warnings})
+
+    queue_ahead = automation_queue.get_status()['queue_size']
+    gap = pacing_policy.gap
+    return {
+        "valid": not errors and not any(app["errors"] for app in apps),
+        "errors": errors,
+        "apps": apps,
+        "resume_app_ids": resume_app_ids,
+        "steps": steps,
+        "estimated_seconds_per_app": round(seconds_per_app, 1),
+        "estimated_total_seconds": round(len(app_names) * seconds_per_app + max(0, len(app_names) - 1) * gap, 1),
+        "queue_ahead": queue_ahead,
+        "estimated_start_in_seconds": round(queue_ahead * (seconds_per_app + gap), 1)
+    }
+
+async def process_app(context, next_app):
+    """Run every step for one queued app and record the outcome. Returns the result status."""
+    global session_status
+
+    app_name = next_app['app_name']
+    bind_log_context(app=app_name)
+    run = {
+        "app_name": app_name,
+        "app_id": next_app.get('app_id'),
+        "step": None,
+        "started_at": time.time(),
+        "step_timings": [],
+        "soft_failures": []
+    }
+    page = await context.new_page()
+    failure = None
+    status = "failed"
+    if CAPTURE_TRACES:
+        await context.tracing.start(screenshots=True, snapshots=True)
+
+    try:
+        log.info("=== Processing app: %s ===", app_name)
+        for step in AUTOMATION_STEPS:
+            if step.name == "create-app" and run["app_id"]:
+                log.info("ℹ️ '%s' already exists as %s, skipping create-app", app_name, run["app_id"])
+                continue
+            await worker_control.wait_while_paused()
+            run["step"] = step.name
+            bind_log_context(step=step.name)
+            step_started = time.monotonic()
+            await step.run(page, run)
+            run["step_timings"].append((step.name, time.monotonic() - step_started))
+            if worker_control.end_step():
+                raise asyncio.CancelledError()
+
+        status = "success"
+        log.info("✅ App '%s' processed and removed from queue.", app_name)
+
+    except asyncio.CancelledError:
+        status = "cancelled"
+        log.info("🛑 Cancelled '%s' during step %s", app_name, run['step'])
+    except SessionExpiredError as e:
+        status = "session_expired"
+        failure = e
+        session_status = {"valid": False, "message": str(e)}
+        log.warning("⚠️ Session expired during processing: %s", e)
+    except PlaywrightTimeoutError as e:
+        log.error("🔥 Timeout for '%s' in step %s: %s", app_name, run['step'], e)
+        status = "timeout"
+        failure = e
+    except Exception as e:
+        log.exception("🔥 Error processing '%s' in step %s: %s", app_name, run['step'], e)
+        failure = e
+    finally:
+        # A cancel landing during cleanup must not skip the ledger row or leave the page open
+        await run_to_completion(finish_app(context, page, run, status, failure))
+
+    return status
+
+async def finish_app(context, page, run, status, failure):
+    artifact = None
+    if failure is not None and status != "session_expired":
+        artifact = await capture_failure_artifacts(context, page, run, failure)
+    elif CAPTURE_TRACES:
+        try:
+            await context.tracing.stop()
+        except Exception as e:
+            log.warning("⚠️ Could not stop trace: %s", e)
+    result_ledger.record(run, status, failure, artifact)
+    try:
+        await page.close()
+    except Exception as e:
+        log.warning("⚠️ Could not close page: %s", e)
+
+async def run_to_completion(coro):
+    """Await coro to the end, absorbing cancellation of the calling task meanwhile."""
+    task = asyncio.ensure_future(coro)
+    while True:
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if task.cancelled():
+                raise
+
+async def automate_play_console():
+    global session_status
+    
+    bind_log_context(worker=WORKER_ID)
+
+    async with async_playwright() as p:
+        browser_session = BrowserSession(p, WORKER_ID)
+        browser_sessions[WORKER_ID] = browser_session
+        await browser_session.start()
+        context = browser_session.context
+
+        if os.path.exists(STORAGE_PATH):
+            log.info("✅ Found existing session, loading it...")
+            page = await context.new_page()
+            
+            # Test if session is still valid
+            await action_scheduler.acquire("navigation")
+            await page.goto(f"{CONSOLE_URL}/", wait_until="domcontentloaded")
+            is_valid, message = await check_session_validity(page)
+            
+            if not is_valid:
+                session_status = {"valid": False, "message": message}
+                log.warning("⚠️ Session is invalid: %s", message)
+                await page.close()
+                await browser_session.close()
+                automation_queue.stop_processing()
+                automation_status["running"] = False
+                return
+            
+            session_status = {"valid": True, "message": "Session is valid"}
+            await page.close()
+        else:
+            log.info("🔓 No saved session, starting fresh...")
+            session_status = {"valid": False, "message": "No session found, please log in"}
+            page = await context.new_page()
+            await action_scheduler.acquire("navigation")
+            await page.goto(f"{CONSOLE_URL}/create-new-app", wait_until="domcontentloaded")
+            await wait_for_login(page)
+            await context.storage_state(path=STORAGE_PATH)
+            session_status = {"valid": True, "message": "New session created"}
+            await page.close()
+
+        log.info("🚀 Automation worker ready to process queue...")
+        automation_queue.start_processing()
+        automation_status["running"] = True
+
+        loop = asyncio.get_running_loop()
+        worker_control.attach(loop)
+        automation_queue.attach(loop)
+
+        while not worker_control.exiting:
+            if not worker_control.accepting_work():
+                await worker_control.wait_for_change()
+                continue
+
+            delay = pacing_policy.remaining()
+            if delay > 0:
+                await worker_control.wait_for_change(timeout=delay)
+                continue
+
+            # Recycle before dequeuing so a failed relaunch leaves the queue untouched
+            try:
+                await browser_session.prepare()
             except Exception as e:
-                print(f"🔥 Error processing '{app_name}': {e}", flush=True)
-                traceback.print_exc()
+                log.exception("🔥 Could not recycle the browser for %s: %s", WORKER_ID, e)
+                await worker_control.wait_for_change(timeout=BROWSER_RETRY_SECONDS)
+                continue
+
+            next_app = await automation_queue.get(interrupt=worker_control.changed)
+            if next_app is None:
+                # A control change woke us; re-check state before waiting again
+                worker_control.changed.clear()
+                continue
+
+            task = asyncio.create_task(process_app(browser_session.context, next_app))
+            worker_control.begin_app(task, next_app['app_name'])
+            try:
+                status = await task
+            except asyncio.CancelledError:
+                # Cancelled before process_app reached its own handler
+                log.info("🛑 Cancelled '%s' before it started", next_app['app_name'])
+                status = "cancelled"
             finally:
-                await page.close()
+                worker_control.end_app()
                 automation_queue.current_processing = None
+                browser_session.app_finished()
+
+            if status == "session_expired":
+                automation_queue.stop_processing()
+                automation_status["running"] = False
+                return
 
-            await asyncio.sleep(10)
+            pacing_policy.finished(status)
+
+        log.info("👋 Worker shutting down...")
+        await browser_session.close()
+        automation_queue.stop_processing()
+        automation_status["running"] = False
 
 def start_automation():
-    asyncio.run(automate_play_console())
+    try:
+        asyncio.run(automate_play_console())
+    finally:
+        worker_control.stopped.set()
 
 worker_thread = threading.Thread(target=start_automation, daemon=True)
-worker_thread.start()
+# GPC_START_WORKER=0 imports the module without a worker, e.g. for the benchmarks
+if os.environ.get("GPC_START_WORKER", "1") == "1":
+    worker_thread.start()
+
+SHUTDOWN_TIMEOUT = float(os.environ.get("GPC_SHUTDOWN_TIMEOUT", "120"))
+
+def shutdown_worker():
+    """Stop the worker on exit, letting an in-flight save finish first."""
+    if worker_thread.is_alive():
+        log.info("🛑 Stopping automation worker...")
+        worker_control.shutdown(force=True)
+        worker_thread.join(SHUTDOWN_TIMEOUT)
+
+atexit.register(shutdown_worker)
 
 # Flask routes
 @app.route('/')
@@ -837,8 +2226,31 @@ def index():
 def health_check():
     return "Server is healthy!", 200
 
+def parse_app_names(app_names_input):
+    return [name.strip() for name in (app_names_input or "").split("\n") if name.strip()]
+
+def form_flag(name):
+    return request.form.get(name, "").lower() in ("1", "true", "yes")
+
+@app.route('/plan_automation', methods=['POST'])
+def plan_automation_route():
+    app_names = parse_app_names(request.form.get("app_names"))
+    if not app_names:
+        return jsonify({"status": "error", "message": "No app names provided!"})
+    plan = plan_automation(app_names, allow_existing=form_flag("allow_existing"))
+    return jsonify({
+        "status": "success" if plan["valid"] else "error",
+        "message": "Batch is valid." if plan["valid"] else "Batch failed validation.",
+        "plan": plan,
+        "session_status": session_status
+    })
+
 @app.route('/run_automation', methods=['POST'])
 def run_automation():
+    # A dry run only plans the batch, so it does not need a valid session
+    if form_flag("dry_run"):
+        return plan_automation_route()
+
     try:
         # Check session status before proceeding
         if not session_status.get("valid", False):
@@ -848,10 +2260,16 @@ def run_automation():
                 "session_status": session_status
             })
 
-        app_names_input = request.form.get("app_names")
-        if app_names_input:
-            app_names = [name.strip() for name in app_names_input.split("\n") if name.strip()]
-            queue_size = automation_queue.add_apps(app_names)
+        app_names = parse_app_names(request.form.get("app_names"))
+        if app_names:
+            plan = plan_automation(app_names, allow_existing=form_flag("allow_existing"))
+            if not plan["valid"]:
+                return jsonify({
+                    "status": "error",
+                    "message": "Batch failed validation, nothing queued.",
+                    "plan": plan
+                })
+            queue_size = automation_queue.add_apps(app_names, plan["resume_app_ids"])
 
             return jsonify({
                 "status": "success",
@@ -863,7 +2281,7 @@ def run_automation():
 
         return jsonify({"status": "error", "message": "No app names provided!"})
     except Exception as e:
-        print(f"🔥 Crash in /run_automation: {e}", flush=True)
+        log.error("🔥 Crash in /run_automation: %s", e)
         return jsonify({"status": "error", "message": str(e)})
 
 @app.route('/automation_status', methods=['GET'])
@@ -874,13 +2292,145 @@ def automation_status_check():
         "current_processing": status['current'],
         "queue_size": status['queue_size'],
         "queue_list": status['queue_list'],
+        "worker": worker_control.get_status(),
+        "workers": {worker_id: session.get_status() for worker_id, session in list(browser_sessions.items())},
+        "throttling": action_scheduler.get_status(),
+        "artifacts": artifact_store.get_links(),
         "session_status": session_status
     })
 
+@app.route('/artifacts/<name>', methods=['GET'])
+def get_artifact(name):
+    if not artifact_store.touch(os.path.basename(name)):
+        abort(404)
+    return send_from_directory(ARTIFACTS_DIR, os.path.basename(name), as_attachment=True)
+
+def parse_timestamp(value):
+    """Accept epoch seconds or an ISO 8601 datetime from a query string."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+def result_filters():
+    return {
+        "app_name": request.args.get("app_name"),
+        "status": request.args.get("status"),
+        "since": parse_timestamp(request.args.get("since")),
+        "until": parse_timestamp(request.args.get("until"))
+    }
+
+RESULT_CSV_COLUMNS = [
+    "id", "app_name", "app_id", "status", "started_at", "finished_at", "duration",
+    "failed_step", "error", "soft_failure_count", "soft_failures", "artifact"
+]
+
+@app.route('/results', methods=['GET'])
+def get_results():
+    try:
+        page_number = max(1, int(request.args.get("page", 1)))
+        per_page = min(500, max(1, int(request.args.get("per_page", 50))))
+        rows, total = result_ledger.query(
+            limit=per_page, offset=(page_number - 1) * per_page, **result_filters()
+        )
+    except ValueError as e:
+        return jsonify({"status": "error", "message": f"Invalid query: {e}"}), 400
+    return jsonify({
+        "status": "success",
+        "results": rows,
+        "page": page_number,
+        "per_page": per_page,
+        "total": total
+    })
+
+@app.route('/results.csv', methods=['GET'])
+def export_results_csv():
+    try:
+        rows, _ = result_ledger.query(**result_filters())
+    except ValueError as e:
+        return jsonify({"status": "error", "message": f"Invalid query: {e}"}), 400
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=RESULT_CSV_COLUMNS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({**row, "soft_failures": json.dumps(row["soft_failures"])})
+    return Response(
+        output.getvalue(),
+        mimetype="text/csv",
+        headers={"Content-Disposition": "attachment; filename=results.csv"}
+    )
+
+@app.route('/results/requeue', methods=['POST'])
+def requeue_failed_results():
+    """Re-queue every app whose latest result in the filtered range failed (cancelled apps excluded)."""
+    try:
+        failed = result_ledger.failed_apps(**result_filters())
+    except ValueError as e:
+        return jsonify({"status": "error", "message": f"Invalid query: {e}"}), 400
+    app_names = [row["app_name"] for row in failed]
+    # Apps that failed after create-app already exist and must not be created again
+    app_ids = {row["app_name"]: row["app_id"] for row in failed if row["app_id"]}
+    queue_size = automation_queue.add_apps(app_names, app_ids) if app_names else automation_queue.get_status()['queue_size']
+    return jsonify({
+        "status": "success",
+        "message": f"{len(app_names)} failed apps re-queued.",
+        "app_names": app_names,
+        "resumed_app_ids": app_ids,
+        "queue_size": queue_size
+    })
+
+@app.route('/control/pause', methods=['POST'])
+def pause_worker():
+    worker_control.pause()
+    return jsonify({"status": "success", "message": "Worker paused.", "worker": worker_control.get_status()})
+
+@app.route('/control/resume', methods=['POST'])
+def resume_worker():
+    worker_control.resume()
+    return jsonify({"status": "success", "message": "Worker resumed.", "worker": worker_control.get_status()})
+
+@app.route('/control/drain', methods=['POST'])
+def drain_worker():
+    worker_control.drain()
+    return jsonify({
+        "status": "success",
+        "message": "Worker draining: in-flight app will finish, no new apps will start.",
+        "worker": worker_control.get_status()
+    })
+
+@app.route('/control/cancel', methods=['POST'])
+def cancel_app():
+    app_name = (request.form.get("app_name") or "").strip()
+    if not app_name:
+        return jsonify({"status": "error", "message": "No app name provided!"})
+    removed = automation_queue.remove_app(app_name)
+    in_flight = worker_control.cancel(app_name)
+    if not removed and not in_flight:
+        return jsonify({"status": "error", "message": f"App '{app_name}' is not queued or in progress."})
+    return jsonify({
+        "status": "success",
+        "message": f"Cancelled '{app_name}': {removed} queued, {'1' if in_flight else '0'} in progress.",
+        "worker": worker_control.get_status()
+    })
+
+@app.route('/control/shutdown', methods=['POST'])
+def shutdown_worker_route():
+    force = request.form.get("force", "").lower() in ("1", "true", "yes")
+    worker_control.shutdown(force=force)
+    return jsonify({
+        "status": "success",
+        "message": "Worker shutting down." if not force else "Worker shutting down, cancelling in-flight app.",
+        "worker": worker_control.get_status()
+    })
+
 @app.route('/session_status', methods=['GET'])
 def get_session_status():
     return jsonify(session_status)
 
 if __name__ == '__main__':
+    # Turn SIGTERM into a normal exit so shutdown_worker runs on redeploys
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
     port = int(os.environ.get('PORT', 5050))
     app.run(host='0.0.0.0', port=port)
\ No newline at end of file
@@ -0,0 +1,354 @@
+"""
+Offline benchmarks for the automation helpers and sections.
+
+Helpers run against benchmarks/fixtures/helpers.html. Sections run against
+console pages recorded into benchmarks/snapshots/ with the `record` command.
+Everything is served through Playwright request routing, so no request
+leaves the machine. Each case reports its latency and the number of
+Playwright protocol round trips, and is compared against benchmarks/baseline.json.
+
+Run from the repository root:
+    python benchmarks/bench_helpers.py                    # run and compare
+    python benchmarks/bench_helpers.py --update-baseline  # accept current numbers
+    python benchmarks/bench_helpers.py record --app-id <id>
+    python benchmarks/bench_helpers.py check-selectors    # store listing upload selectors
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+import sys
+import time
+
+# Import the automation module without starting its worker
+os.environ.setdefault("GPC_START_WORKER", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import GPC_Automation as gpc  # noqa: E402
+from playwright.async_api import async_playwright  # noqa: E402
+from playwright._impl._connection import Channel  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+SNAPSHOTS_DIR = os.path.join(BENCH_DIR, "snapshots")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+FIXTURE_URL = "http://gpc-bench.local/helpers.html"
+BENCH_APP_ID = "bench"
+
+# Sections that stay on a single page and so can be replayed from one snapshot.
+# The others open overlays or navigate on click and need a live console.
+REPLAYABLE_SECTIONS = [
+    "privacy-policy",
+    "ads-declaration",
+    "target-audience-content",
+    "government-apps",
+    "financial-features",
+    "health",
+]
+# Recorded alongside the sections so the upload selectors can be checked offline
+STORE_LISTING_SNAPSHOT = "main-store-listing"
+
+class RoundTripCounter:
+    """Counts Playwright protocol requests that wait for a reply from the driver.
+
+    Patches the private method every request/response call in the client goes
+    through: Channel.inner_send up to Playwright 1.48 (including the pinned
+    1.39) and Channel._inner_send from 1.49. Checked against 1.20, 1.30, 1.39,
+    1.48, 1.49 and 1.64; any other layout stops the run rather than miscount.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._method = next((name for name in ("_inner_send", "inner_send") if hasattr(Channel, name)), None)
+        if self._method is None:
+            raise RuntimeError(
+                "This Playwright version has neither Channel._inner_send nor Channel.inner_send; "
+                "update RoundTripCounter before benchmarking"
+            )
+        self._original = getattr(Channel, self._method)
+
+    def install(self):
+        counter = self
+        original = self._original
+
+        async def counting_send(channel, *args, **kwargs):
+            counter.count += 1
+            return await original(channel, *args, **kwargs)
+
+        setattr(Channel, self._method, counting_send)
+
+    def uninstall(self):
+        setattr(Channel, self._method, self._original)
+
+class SleepRecorder:
+    """Stands in for the asyncio module inside GPC_Automation.
+
+    Fixed settle sleeps (e.g. 15s after a save) are recorded rather than waited,
+    so section latency reflects the work done instead of the pauses.
+    """
+
+    def __init__(self):
+        self.slept = 0.0
+
+    async def sleep(self, seconds, result=None):
+        self.slept += seconds
+        await asyncio.sleep(0)
+        return result
+
+    def __getattr__(self, name):
+        return getattr(asyncio, name)
+
+def helper_cases():
+    """(name, coroutine function taking the page, iterations) for each helper."""
+
+    async def click_save(page):
+        element = await page.query_selector("#save")
+        await gpc.click_element(page, element, "save")
+
+    async def click_obscured(page):
+        # Pointer click times out on the overlay, exercising the dispatch_event fallback
+        element = await page.query_selector("#obscured")
+        await gpc.click_element(page, element, "obscured")
+
+    return [
+        ("wait_for_element", lambda page: gpc.wait_for_element(page, "#save"), 10),
+        ("click_element", click_save, 10),
+        ("click_element_fallback", click_obscured, 2),
+        ("click_button_by_xpath", lambda page: gpc.click_button_by_xpath(page, "//*[@id='save']/span"), 10),
+        ("click_button_by_material_radio_debug_id",
+         lambda page: gpc.click_button_by_material_radio_debug_id(page, "app-radio"), 10),
+        ("click_button_by_console_form_expandable_debug_id",
+         lambda page: gpc.click_button_by_console_form_expandable_debug_id(page, "login-required-expandable-section"), 10),
+        ("click_button_by_material_radio_group_debug_id",
+         lambda page: gpc.click_button_by_material_radio_group_debug_id(page, "contains-ads-radio-group", index=1), 10),
+        ("click_button_ingroup_by_material_radio_group_debug_id",
+         lambda page: gpc.click_button_ingroup_by_material_radio_group_debug_id(
+             page, "question-category-title", 4, "single-response-radio-group", 0, 1), 10),
+        ("click_checkbox_by_debug_id", lambda page: gpc.click_checkbox_by_debug_id(page, "guidelines-checkbox"), 10),
+        ("click_checkbox_by_debug_id_scrolled",
+         lambda page: gpc.click_checkbox_by_debug_id(page, "age-band-checkboxes", index=5), 10),
+        ("upload_csv_from_static_file", lambda page: gpc.upload_csv_from_static_file(page, gpc.DATA_SAFETY_CSV), 5),
+    ]
+
+def section_cases():
+    steps = {step.name: step for step in gpc.AUTOMATION_STEPS}
+    cases = []
+    for name in REPLAYABLE_SECTIONS:
+        if not os.path.exists(os.path.join(SNAPSHOTS_DIR, f"{name}.html")):
+            continue
+
+        async def run_section(page, step=steps[name]):
+            run = {
+                "app_name": "Benchmark App",
+                "app_id": BENCH_APP_ID,
+                "step": step.name,
+                "started_at": time.time(),
+                "step_timings": [],
+                "soft_failures": []
+            }
+            await step.run(page, run)
+            return run["soft_failures"]
+
+        cases.append((f"section:{name}", run_section, 3))
+    return cases
+
+async def route_locally(route):
+    """Serve fixtures and recorded snapshots; refuse everything else."""
+    url = route.request.url
+    if url.startswith("http://gpc-bench.local/"):
+        path = os.path.join(FIXTURES_DIR, os.path.basename(url.split("?")[0]))
+        if os.path.exists(path):
+            return await route.fulfill(path=path, content_type="text/html")
+    match = re.search(r"/app-content/([^/?]+)", url)
+    if match and os.path.exists(os.path.join(SNAPSHOTS_DIR, f"{match.group(1)}.html")):
+        return await route.fulfill(path=os.path.join(SNAPSHOTS_DIR, f"{match.group(1)}.html"), content_type="text/html")
+    await route.abort()
+
+async def run_case(page, counter, sleeps, name, case, iterations, timeout):
+    timings, round_trips, soft_failures = [], [], 0
+    for _ in range(iterations):
+        if name.startswith("section:"):
+            await page.goto("about:blank")
+        else:
+            await page.goto(FIXTURE_URL)
+        counter.count = 0
+        sleeps.slept = 0.0
+        started = time.perf_counter()
+        # Helpers such as wait_for_element pass their own 5 minute timeout,
+        # which the page default does not override
+        result = await asyncio.wait_for(case(page), timeout)
+        timings.append((time.perf_counter() - started) * 1000)
+        round_trips.append(counter.count)
+        soft_failures = max(soft_failures, len(result) if isinstance(result, list) else 0)
+    return {
+        "median_ms": round(statistics.median(timings), 2),
+        "min_ms": round(min(timings), 2),
+        "max_ms": round(max(timings), 2),
+        "round_trips": int(statistics.median(round_trips)),
+        "settle_s": round(sleeps.slept, 1),
+        "soft_failures": soft_failures,
+        "iterations": iterations
+    }
+
+async def run_benchmarks(args):
+    # Replay needs neither throttling nor the fixed settle pauses
+    gpc.action_scheduler = gpc.ActionScheduler({"navigation": (1000, 1000), "save": (1000, 1000)})
+    sleeps = SleepRecorder()
+    gpc.asyncio = sleeps
+    counter = RoundTripCounter()
+
+    cases = helper_cases() + section_cases()
+    if args.only:
+        cases = [case for case in cases if re.search(args.only, case[0])]
+
+    results = {}
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=gpc.BROWSER_ARGS)
+        context = await browser.new_context(no_viewport=True)
+        page = await context.new_page()
+        page.set_default_timeout(args.action_timeout)
+        await page.route("**/*", route_locally)
+        counter.install()
+        try:
+            for name, case, iterations in cases:
+                timeout = args.section_timeout if name.startswith("section:") else args.case_timeout
+                try:
+                    results[name] = await run_case(page, counter, sleeps, name, case, args.iterations or iterations, timeout)
+                except Exception as e:
+                    results[name] = {"error": f"{type(e).__name__}: {e}"}
+        finally:
+            counter.uninstall()
+            await browser.close()
+    return results
+
+def compare(results, baseline, tolerance):
+    """Return a list of regression messages against the baseline."""
+    regressions = []
+    for name, result in results.items():
+        # A case that errors is a regression even before it has a baseline
+        if "error" in result:
+            regressions.append(f"{name}: failed ({result['error']})")
+            continue
+        # Clicks that soft-fail on a stale snapshot make a section look faster, not slower
+        if name.startswith("section:") and result["soft_failures"]:
+            regressions.append(f"{name}: {result['soft_failures']} soft failures")
+            continue
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if result["soft_failures"] > previous.get("soft_failures", 0):
+            regressions.append(f"{name}: {result['soft_failures']} soft failures vs baseline {previous.get('soft_failures', 0)}")
+        if result["median_ms"] > previous["median_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: median {result['median_ms']}ms vs baseline {previous['median_ms']}ms")
+        if result["round_trips"] > previous["round_trips"]:
+            regressions.append(f"{name}: {result['round_trips']} round trips vs baseline {previous['round_trips']}")
+    return regressions
+
+def print_report(results, baseline):
+    print(f"{'case':<56} {'median ms':>10} {'base ms':>9} {'trips':>6} {'base':>5} {'settle s':>9} {'soft':>5}")
+    for name, result in results.items():
+        if "error" in result:
+            print(f"{name:<56} ERROR {result['error']}")
+            continue
+        previous = baseline.get(name, {})
+        print(f"{name:<56} {result['median_ms']:>10} {previous.get('median_ms', '-'):>9} "
+              f"{result['round_trips']:>6} {previous.get('round_trips', '-'):>5} {result['settle_s']:>9} "
+              f"{result['soft_failures']:>5}")
+
+async def record_snapshots(args):
+    """Save the rendered DOM of each replayable section of a live app, without scripts."""
+    if not os.path.exists(gpc.STORAGE_PATH):
+        sys.exit(f"No saved session at {gpc.STORAGE_PATH}; log in through the app first.")
+    os.makedirs(SNAPSHOTS_DIR, exist_ok=True)
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=gpc.BROWSER_ARGS)
+        context = await browser.new_context(storage_state=gpc.STORAGE_PATH, no_viewport=True)
+        page = await context.new_page()
+        for section in REPLAYABLE_SECTIONS:
+            await gpc.goto_app_section_until_success(page, args.app_id, section)
+            await save_snapshot(page, section)
+        await page.goto(f"{gpc.CONSOLE_URL}/app/{args.app_id}/{STORE_LISTING_SNAPSHOT}", wait_until="domcontentloaded")
+        await save_snapshot(page, STORE_LISTING_SNAPSHOT)
+        await browser.close()
+
+async def save_snapshot(page, name):
+    await page.wait_for_selector("#main-content", state="visible")
+    await page.wait_for_load_state("networkidle")
+    html = re.sub(r"<script\b[^>]*>.*?</script>", "", await page.content(), flags=re.S | re.I)
+    with open(os.path.join(SNAPSHOTS_DIR, f"{name}.html"), "w", encoding="utf-8") as f:
+        f.write(html)
+    print(f"Recorded {name}")
+
+async def check_selectors():
+    """Check every store listing upload input selector matches the recorded page. Returns the misses."""
+    path = os.path.join(SNAPSHOTS_DIR, f"{STORE_LISTING_SNAPSHOT}.html")
+    if not os.path.exists(path):
+        sys.exit(f"No snapshot at {path}; run the record command first.")
+    with open(path, encoding="utf-8") as f:
+        html = f.read()
+    missing = []
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=gpc.BROWSER_ARGS)
+        page = await browser.new_page()
+        await page.route("**/*", lambda route: route.abort())
+        await page.set_content(html, wait_until="domcontentloaded")
+        for kind, (input_selector, _) in gpc.STORE_LISTING_UPLOAD_SELECTORS.items():
+            count = await page.locator(input_selector).count()
+            print(f"{kind:<20} {count:>3} match(es)  {input_selector}")
+            if count == 0:
+                missing.append(kind)
+        await browser.close()
+    return missing
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", nargs="?", default="run", choices=["run", "record", "check-selectors"])
+    parser.add_argument("--app-id", help="App to record section snapshots from")
+    parser.add_argument("--only", help="Regex selecting which cases to run")
+    parser.add_argument("--iterations", type=int, help="Override iterations per case")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed median slowdown before flagging")
+    parser.add_argument("--action-timeout", type=int, default=2000, help="Playwright default timeout in ms")
+    parser.add_argument("--case-timeout", type=float, default=30, help="Seconds before a helper case is abandoned")
+    parser.add_argument("--section-timeout", type=float, default=60, help="Seconds before a section replay is abandoned")
+    parser.add_argument("--update-baseline", action="store_true", help="Write these results as the new baseline")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        if not args.app_id:
+            parser.error("record needs --app-id")
+        asyncio.run(record_snapshots(args))
+        return
+
+    if args.command == "check-selectors":
+        missing = asyncio.run(check_selectors())
+        if missing:
+            print(f"MISSING upload inputs for: {', '.join(missing)}")
+        sys.exit(1 if missing else 0)
+
+    results = asyncio.run(run_benchmarks(args))
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+    print_report(results, baseline)
+
+    if args.update_baseline:
+        merged = {**baseline, **{name: result for name, result in results.items() if "error" not in result}}
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(merged, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {BASELINE_PATH}")
+        return
+
+    if not baseline:
+        # Without a baseline nothing can be compared, so don't report a pass
+        print(f"No baseline at {BASELINE_PATH}; run with --update-baseline to create one.")
+        sys.exit(2)
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()